@@ -11,25 +11,63 @@ export MYSQL_DATADIR=/var/lib/mysql/data
 export MYSQL_DEFAULTS_FILE=${MYSQL_DEFAULTS_FILE:-/etc/my.cnf}
 
 function export_setting_variables() {
+  # Export the memory and CPU limit variables first, the defaults below depend on them
+  local export_vars=$(cgroup-limits) && export $export_vars || exit 1
+
+  if [ -z "${MYSQL_CHARSET:-}" ] && [ -n "${MYSQL_COLLATION:-}" ]; then
+    # The name of a collation starts with the name of its character set
+    export MYSQL_CHARSET=${MYSQL_COLLATION%%_*}
+  fi
+  export MYSQL_CHARSET=${MYSQL_CHARSET:-utf8mb4}
   export MYSQL_BINLOG_FORMAT=${MYSQL_BINLOG_FORMAT:-STATEMENT}
+  export MYSQL_BINLOG_ROW_IMAGE=${MYSQL_BINLOG_ROW_IMAGE:-FULL}
+  export MYSQL_BINLOG_COMPRESS=${MYSQL_BINLOG_COMPRESS:-OFF}
+  export MYSQL_BINLOG_CACHE_SIZE=${MYSQL_BINLOG_CACHE_SIZE:-32K}
+  export MYSQL_MAX_BINLOG_SIZE=${MYSQL_MAX_BINLOG_SIZE:-1G}
+  export MYSQL_BINLOG_EXPIRE_LOGS_SECONDS=${MYSQL_BINLOG_EXPIRE_LOGS_SECONDS:-0}
+  export MYSQL_SLAVE_READ_ONLY=${MYSQL_SLAVE_READ_ONLY:-ON}
+  export MYSQL_SLAVE_PARALLEL_THREADS=${MYSQL_SLAVE_PARALLEL_THREADS:-0}
+  export MYSQL_SLAVE_PARALLEL_MODE=${MYSQL_SLAVE_PARALLEL_MODE:-conservative}
   export MYSQL_LOWER_CASE_TABLE_NAMES=${MYSQL_LOWER_CASE_TABLE_NAMES:-0}
   export MYSQL_LOG_QUERIES_ENABLED=${MYSQL_LOG_QUERIES_ENABLED:-0}
+  export MYSQL_SLOW_QUERY_LOG=${MYSQL_SLOW_QUERY_LOG:-0}
+  export MYSQL_SLOW_QUERY_LOG_FILE=${MYSQL_SLOW_QUERY_LOG_FILE:-${MYSQL_DATADIR}/mysql-slow.log}
+  export MYSQL_LONG_QUERY_TIME=${MYSQL_LONG_QUERY_TIME:-1}
+  export MYSQL_LOG_SLOW_RATE_LIMIT=${MYSQL_LOG_SLOW_RATE_LIMIT:-1}
+  export MYSQL_LOG_QUERIES_NOT_USING_INDEXES=${MYSQL_LOG_QUERIES_NOT_USING_INDEXES:-0}
+  export MYSQL_LOG_ROTATE_SIZE=${MYSQL_LOG_ROTATE_SIZE:-100M}
+  export MYSQL_LOG_ROTATE_FILES=${MYSQL_LOG_ROTATE_FILES:-3}
+  export MYSQL_PERFORMANCE_SCHEMA=${MYSQL_PERFORMANCE_SCHEMA:-off}
   export MYSQL_MAX_CONNECTIONS=${MYSQL_MAX_CONNECTIONS:-151}
+  export MYSQL_MAX_USER_CONNECTIONS=${MYSQL_MAX_USER_CONNECTIONS:-0}
+  export MYSQL_THREAD_HANDLING=${MYSQL_THREAD_HANDLING:-one-thread-per-connection}
+  export MYSQL_THREAD_POOL_SIZE=${MYSQL_THREAD_POOL_SIZE:-${NUMBER_OF_CORES:-1}}
+  export MYSQL_THREAD_POOL_MAX_THREADS=${MYSQL_THREAD_POOL_MAX_THREADS:-1000}
+  export MYSQL_QUERY_CACHE_TYPE=${MYSQL_QUERY_CACHE_TYPE:-OFF}
+  export MYSQL_QUERY_CACHE_SIZE=${MYSQL_QUERY_CACHE_SIZE:-16M}
+  export MYSQL_QUERY_CACHE_LIMIT=${MYSQL_QUERY_CACHE_LIMIT:-1M}
   export MYSQL_FT_MIN_WORD_LEN=${MYSQL_FT_MIN_WORD_LEN:-4}
   export MYSQL_FT_MAX_WORD_LEN=${MYSQL_FT_MAX_WORD_LEN:-20}
   export MYSQL_AIO=${MYSQL_AIO:-1}
   export MYSQL_MAX_ALLOWED_PACKET=${MYSQL_MAX_ALLOWED_PACKET:-200M}
-  export MYSQL_TABLE_OPEN_CACHE=${MYSQL_TABLE_OPEN_CACHE:-400}
   export MYSQL_SORT_BUFFER_SIZE=${MYSQL_SORT_BUFFER_SIZE:-256K}
-
-  # Export memory limit variables and calculate limits
-  local export_vars=$(cgroup-limits) && export $export_vars || exit 1
+  export MYSQL_TMPDIR=${MYSQL_TMPDIR:-/tmp}
+  export MYSQL_INNODB_FAST_SHUTDOWN=${MYSQL_INNODB_FAST_SHUTDOWN:-1}
+
+  # Calculate limits from the memory and CPU limit variables
+  size_table_caches
+  export MYSQL_INNODB_LOG_SIZING=${MYSQL_INNODB_LOG_SIZING:-memory}
+  export MYSQL_INNODB_LOG_TARGET_MINUTES=${MYSQL_INNODB_LOG_TARGET_MINUTES:-60}
+  if [ "${MYSQL_INNODB_LOG_SIZING}" == "adaptive" ] && [ -z "${MYSQL_INNODB_LOG_FILE_SIZE:-}" ]; then
+    adaptive_log_file_size
+  fi
   if [ -n "${NO_MEMORY_LIMIT:-}" -o -z "${MEMORY_LIMIT_IN_BYTES:-}" ]; then
     export MYSQL_KEY_BUFFER_SIZE=${MYSQL_KEY_BUFFER_SIZE:-32M}
     export MYSQL_READ_BUFFER_SIZE=${MYSQL_READ_BUFFER_SIZE:-8M}
     export MYSQL_INNODB_BUFFER_POOL_SIZE=${MYSQL_INNODB_BUFFER_POOL_SIZE:-32M}
     export MYSQL_INNODB_LOG_FILE_SIZE=${MYSQL_INNODB_LOG_FILE_SIZE:-8M}
     export MYSQL_INNODB_LOG_BUFFER_SIZE=${MYSQL_INNODB_LOG_BUFFER_SIZE:-8M}
+    export MYSQL_TMP_TABLE_SIZE=${MYSQL_TMP_TABLE_SIZE:-16M}
   else
     export MYSQL_KEY_BUFFER_SIZE=${MYSQL_KEY_BUFFER_SIZE:-$((MEMORY_LIMIT_IN_BYTES/1024/1024/10))M}
     export MYSQL_READ_BUFFER_SIZE=${MYSQL_READ_BUFFER_SIZE:-$((MEMORY_LIMIT_IN_BYTES/1024/1024/20))M}
@@ -38,13 +76,91 @@ function export_setting_variables() {
     # precision as possible with whole numbers. Result is 15% of memory.
     export MYSQL_INNODB_LOG_FILE_SIZE=${MYSQL_INNODB_LOG_FILE_SIZE:-$((MEMORY_LIMIT_IN_BYTES*15/1024/1024/100))M}
     export MYSQL_INNODB_LOG_BUFFER_SIZE=${MYSQL_INNODB_LOG_BUFFER_SIZE:-$((MEMORY_LIMIT_IN_BYTES*15/1024/1024/100))M}
+    # Every connection may hold an in-memory temporary table, so only 2% of memory
+    # is given to a single table, at least 16M and at most 256M.
+    local tmp_table_size=$((MEMORY_LIMIT_IN_BYTES/1024/1024/50))
+    [ ${tmp_table_size} -lt 16 ] && tmp_table_size=16
+    [ ${tmp_table_size} -gt 256 ] && tmp_table_size=256
+    export MYSQL_TMP_TABLE_SIZE=${MYSQL_TMP_TABLE_SIZE:-${tmp_table_size}M}
   fi
+  # The smaller of the two limits applies to the internal temporary tables
+  export MYSQL_MAX_HEAP_TABLE_SIZE=${MYSQL_MAX_HEAP_TABLE_SIZE:-${MYSQL_TMP_TABLE_SIZE}}
   export MYSQL_DATADIR_ACTION=${MYSQL_DATADIR_ACTION:-upgrade-warn}
 }
 
+# Size the table caches from the number of tables in the datadir, counted
+# cheaply as the .frm files every table has, so a schema with thousands of tables
+# is not evicted from the cache all the time. Every cached table may keep two
+# files open, so the caches are bounded by the file descriptor limit.
+function size_table_caches() {
+  local tables fd_limit max_open_cache open_cache definition_cache open_cache_instances open_files
+  local var
+  # The limits are calculated in shell arithmetic, which fails unclearly on other values
+  for var in MYSQL_MAX_CONNECTIONS MYSQL_TABLE_OPEN_CACHE; do
+    if [ -n "${!var:-}" ] && ! [[ "${!var}" =~ ^[0-9]+$ ]]; then
+      log_warn "${var} must be a number, got '${!var}'."
+      exit 1
+    fi
+  done
+  tables=$(find ${MYSQL_DATADIR} -mindepth 2 -maxdepth 2 -name '*.frm' 2>/dev/null | wc -l)
+  fd_limit=$(ulimit -Hn)
+  [ "${fd_limit}" == "unlimited" ] && fd_limit=1048576
+  max_open_cache=$(( (fd_limit - MYSQL_MAX_CONNECTIONS - 10) / 2 ))
+  [ ${max_open_cache} -lt 64 ] && max_open_cache=64
+
+  if [ -z "${MYSQL_TABLE_OPEN_CACHE:-}" ]; then
+    open_cache=$(( tables * 12 / 10 ))
+    [ ${open_cache} -lt 400 ] && open_cache=400
+    if [ ${open_cache} -gt ${max_open_cache} ]; then
+      log_warn "The file descriptor limit ${fd_limit} allows caching only ${max_open_cache} of the ${tables} tables"
+      open_cache=${max_open_cache}
+    fi
+    [ ${tables} -gt 0 ] && log_info "Sizing table_open_cache to ${open_cache} for ${tables} tables"
+    export MYSQL_TABLE_OPEN_CACHE=${open_cache}
+  fi
+  definition_cache=$(( tables * 11 / 10 ))
+  [ ${definition_cache} -lt 400 ] && definition_cache=400
+  export MYSQL_TABLE_DEFINITION_CACHE=${MYSQL_TABLE_DEFINITION_CACHE:-${definition_cache}}
+  open_cache_instances=${NUMBER_OF_CORES:-8}
+  [ ${open_cache_instances} -gt 8 ] && open_cache_instances=8
+  export MYSQL_TABLE_OPEN_CACHE_INSTANCES=${MYSQL_TABLE_OPEN_CACHE_INSTANCES:-${open_cache_instances}}
+  open_files=$(( MYSQL_TABLE_OPEN_CACHE * 2 + MYSQL_MAX_CONNECTIONS + 10 ))
+  [ ${open_files} -gt ${fd_limit} ] && open_files=${fd_limit}
+  export MYSQL_OPEN_FILES_LIMIT=${MYSQL_OPEN_FILES_LIMIT:-${open_files}}
+}
+
+# File in the datadir with the peak redo log generation rate in bytes per minute,
+# recorded by start_redo_rate_sampler
+redo_rate_file=${MYSQL_DATADIR}/mysql_redo_rate
+
+# Size innodb_log_file_size to hold MYSQL_INNODB_LOG_TARGET_MINUTES of the redo
+# log generated at the rate recorded during the previous runs, so the checkpoints
+# do not throttle the writes and the crash recovery has a bounded amount of redo
+# to apply
+function adaptive_log_file_size() {
+  local rate size
+  rate=$(cat ${redo_rate_file} 2>/dev/null) || :
+  if ! [[ "${rate}" =~ ^[0-9]+$ ]] || [ "${rate}" -eq 0 ]; then
+    log_info "No redo log generation rate recorded yet, sizing innodb_log_file_size from the memory"
+    return 0
+  fi
+  size=$(( rate * MYSQL_INNODB_LOG_TARGET_MINUTES / 1024 / 1024 ))
+  # Keep the size within the limits that make sense regardless of the workload
+  [ ${size} -ge 32 ] || size=32
+  [ ${size} -le 16384 ] || size=16384
+  export MYSQL_INNODB_LOG_FILE_SIZE=${size}M
+  log_info "Redo log generated at up to $(( rate / 1024 / 1024 ))M per minute, sizing innodb_log_file_size to ${size}M for ${MYSQL_INNODB_LOG_TARGET_MINUTES} minutes"
+}
+
 # this stores whether the database was initialized from empty datadir
 export MYSQL_DATADIR_FIRST_INIT=false
 
+# this stores whether the datadir was initialized from the datadir prebuilt by s2i
+export MYSQL_DATADIR_PREBUILT=false
+
+# Directory where the s2i build stores the prebuilt data directory
+prebuilt_datadir_root=${APP_DATA}/../mysql-prebuilt-datadir
+
 # Be paranoid and stricter than we should be.
 # https://dev.mysql.com/doc/refman/en/identifiers.html
 mysql_identifier_regex='^[a-zA-Z0-9_]+$'
@@ -88,12 +204,140 @@ function start_local_mysql() {
 # Shutdown mysql flushing privileges
 function shutdown_local_mysql() {
   log_info 'Shutting down MySQL ...'
+  local started=$(date +%s)
   mysqladmin $admin_flags flush-privileges shutdown
+  [ -z "${mysql_pid:-}" ] || wait ${mysql_pid} || :
+  log_info "MySQL shut down in $(( $(date +%s) - started )) seconds"
 }
 
-# Initialize the MySQL database (create user accounts and the initial database)
-function initialize_database() {
-  log_info 'Initializing database ...'
+# Marker of the final server start, until it exists the liveness probe reports the
+# container as alive since the entrypoint is still initializing. A marker left by
+# a previous run of the container is removed when the entrypoint starts.
+mysqld_started_file=/tmp/mysqld-started
+rm -f ${mysqld_started_file}
+
+# Run the server as the main process of the container. When MYSQL_SHUTDOWN_TIMEOUT
+# is set, the server runs as a child, so the termination signal can be handled by
+# managed_shutdown instead of the server's default handling.
+function exec_mysqld() {
+  touch ${mysqld_started_file}
+  if [ -z "${MYSQL_SHUTDOWN_TIMEOUT:-}" ]; then
+    exec ${MYSQL_PREFIX}/libexec/mysqld --defaults-file=$MYSQL_DEFAULTS_FILE "$@" 2>&1
+  fi
+
+  # The trap is installed before mysqld starts, so a signal that arrives before
+  # its pid is known is remembered and handled right after the start
+  local rc shutdown_requested=
+  mysqld_pid=
+  trap 'shutdown_requested=1; [ -z "${mysqld_pid:-}" ] || managed_shutdown ${mysqld_pid}' TERM INT
+  ${MYSQL_PREFIX}/libexec/mysqld --defaults-file=$MYSQL_DEFAULTS_FILE "$@" 2>&1 &
+  mysqld_pid=$!
+  if [ -n "${shutdown_requested}" ] && [ -z "${shutdown_started:-}" ]; then
+    managed_shutdown ${mysqld_pid}
+  fi
+  while true; do
+    wait ${mysqld_pid} && rc=0 || rc=$?
+    # wait returns early when the trap was run, the server is still stopping
+    kill -0 ${mysqld_pid} 2>/dev/null || break
+  done
+  [ -z "${shutdown_started:-}" ] || log_info "MySQL shut down in $(( $(date +%s) - shutdown_started )) seconds"
+  exit ${rc}
+}
+
+# Flush the InnoDB dirty pages while the server still runs, for at most
+# MYSQL_SHUTDOWN_TIMEOUT seconds, then stop the server. If the pages could not be
+# flushed in time, the server stops without flushing the rest and InnoDB recovers
+# them from the redo log on the next start, rather than being killed.
+function managed_shutdown() {
+  local pid=$1 dirty=
+  shutdown_started=$(date +%s)
+  log_info "Flushing InnoDB dirty pages before the shutdown (at most ${MYSQL_SHUTDOWN_TIMEOUT} seconds) ..."
+  mysql -u root -e 'SET GLOBAL innodb_max_dirty_pages_pct = 0' || :
+  while [ $(( $(date +%s) - shutdown_started )) -lt ${MYSQL_SHUTDOWN_TIMEOUT} ]; do
+    dirty=$(mysql -u root -N -B -e "SELECT VARIABLE_VALUE FROM information_schema.GLOBAL_STATUS
+                                     WHERE VARIABLE_NAME = 'INNODB_BUFFER_POOL_PAGES_DIRTY'") || break
+    [ "${dirty}" -gt 0 ] || break
+    sleep 1
+  done
+  if [ "${dirty:-0}" -gt 0 ]; then
+    log_warn "${dirty} dirty pages left after ${MYSQL_SHUTDOWN_TIMEOUT} seconds, shutting down without flushing them"
+    mysql -u root -e 'SET GLOBAL innodb_fast_shutdown = 2' || :
+  else
+    log_info "Dirty pages flushed in $(( $(date +%s) - shutdown_started )) seconds, shutting down ..."
+  fi
+  kill -TERM ${pid}
+}
+
+# Durations of the startup stages, written out for mysqld-metrics when the
+# metrics exporter is started
+startup_timings=
+startup_stage_started=$(date +%s.%N)
+
+# Record the duration of the startup stage $1, which ends now
+function startup_stage_done() {
+  local stage=$1 now=$(date +%s.%N)
+  local seconds=$(awk -v start=${startup_stage_started} -v end=${now} 'BEGIN { printf "%.3f", end - start }')
+  log_info "Startup stage ${stage} finished in ${seconds} seconds"
+  startup_timings+="${stage} ${seconds}"$'\n'
+  startup_stage_started=${now}
+}
+
+# Serve the metrics over HTTP on MYSQL_METRICS_PORT, every connection is
+# answered by mysqld-metrics
+function start_metrics_exporter() {
+  [ -n "${MYSQL_METRICS_PORT:-}" ] || return 0
+  echo -n "${startup_timings}" > /tmp/mysql-startup-timings
+  log_info "Serving metrics on port ${MYSQL_METRICS_PORT} ..."
+  ncat --listen --keep-open --max-conns 8 \
+    --exec /usr/bin/mysqld-metrics ${MYSQL_METRICS_PORT} </dev/null &>/dev/null &
+}
+
+# Rotate the log file $1 when it grows over MYSQL_LOG_ROTATE_SIZE, keeping
+# MYSQL_LOG_ROTATE_FILES old files; the server reopens the file on FLUSH $2 LOGS
+function rotate_log() {
+  local file=$1 log=$2 i
+  [ -f "${file}" ] || return 0
+  [ $(stat -c %s "${file}") -gt $(numfmt --from=iec ${MYSQL_LOG_ROTATE_SIZE}) ] || return 0
+  for (( i = MYSQL_LOG_ROTATE_FILES; i > 1; i-- )); do
+    [ ! -f "${file}.$(( i - 1 ))" ] || mv -f "${file}.$(( i - 1 ))" "${file}.${i}"
+  done
+  mv -f "${file}" "${file}.1"
+  mysql -u root -e "FLUSH ${log} LOGS" || log_warn "Could not reopen ${file} after the rotation"
+}
+
+# Check the size of the query log files every minute in the background,
+# so they cannot fill the data volume
+function start_log_rotation() {
+  [ "${MYSQL_LOG_QUERIES_ENABLED}" == "1" ] || [ "${MYSQL_SLOW_QUERY_LOG}" == "1" ] || return 0
+  log_info "Rotating the query logs at ${MYSQL_LOG_ROTATE_SIZE}, keeping ${MYSQL_LOG_ROTATE_FILES} files ..."
+  while sleep 60; do
+    [ "${MYSQL_LOG_QUERIES_ENABLED}" != "1" ] || rotate_log ${MYSQL_DATADIR}/mysql-query.log GENERAL
+    [ "${MYSQL_SLOW_QUERY_LOG}" != "1" ] || rotate_log ${MYSQL_SLOW_QUERY_LOG_FILE} SLOW
+  done </dev/null &
+}
+
+# Record the peak redo log generation rate per minute in the background for
+# adaptive_log_file_size; the peak decays slowly (to a half in about 12 hours),
+# so the size follows the changes of the workload
+function start_redo_rate_sampler() {
+  [ "${MYSQL_INNODB_LOG_SIZING}" == "adaptive" ] || return 0
+  log_info "Recording the redo log generation rate into ${redo_rate_file} ..."
+  local lsn previous= rate
+  rate=$(cat ${redo_rate_file} 2>/dev/null) || rate=0
+  [[ "${rate}" =~ ^[0-9]+$ ]] || rate=0
+  while sleep 60; do
+    lsn=$(mysql -u root -N -B -e "SELECT VARIABLE_VALUE FROM information_schema.GLOBAL_STATUS
+                                   WHERE VARIABLE_NAME = 'INNODB_LSN_CURRENT'") || continue
+    if [ -n "${previous}" ]; then
+      rate=$(( lsn - previous > rate * 1023 / 1024 ? lsn - previous : rate * 1023 / 1024 ))
+      echo ${rate} > ${redo_rate_file}.tmp && mv -f ${redo_rate_file}.tmp ${redo_rate_file}
+    fi
+    previous=${lsn}
+  done </dev/null &
+}
+
+# Create the system tables in the empty data directory and start the local server
+function install_database() {
   log_info 'Running mysql_install_db ...'
   # Using --rpm since we need mysql_install_db behaves as in RPM
   # Using --auth-root-authentication-method=normal because we are not root in the container
@@ -105,6 +349,23 @@ function initialize_database() {
   # which is necessary to detect which version of the mysqld daemon created the data.
   # Checking empty file should not take longer than a second and one extra check should not harm.
   mysql_upgrade ${admin_flags}
+}
+
+# Create the database specified by MYSQL_DATABASE
+function create_database() {
+  log_info "Creating database ${MYSQL_DATABASE} ..."
+  # The character set and collation come from the server defaults, see charset.cnf
+  mysqladmin $admin_flags create "${MYSQL_DATABASE}"
+}
+
+# Initialize the MySQL database (create user accounts and the initial database)
+function initialize_database() {
+  log_info 'Initializing database ...'
+  if copy_prebuilt_datadir; then
+    start_local_mysql "$@"
+  else
+    install_database "$@"
+  fi
 
   if [ -v MYSQL_RUNNING_AS_SLAVE ]; then
     log_info 'Initialization finished'
@@ -136,19 +397,9 @@ EOSQL
   fi
 
   if [ -v MYSQL_DATABASE ]; then
-    log_info "Creating database ${MYSQL_DATABASE} ..."
-    mysqladmin $admin_flags create "${MYSQL_DATABASE}"
-    if [ -v MYSQL_CHARSET ]; then
-        log_info "Changing character set to ${MYSQL_CHARSET} ..."
-mysql $mysql_flags <<EOSQL
-      ALTER DATABASE \`${MYSQL_DATABASE}\` CHARACTER SET \`${MYSQL_CHARSET}\` ;
-EOSQL
-    fi
-    if [ -v MYSQL_COLLATION ]; then
-        log_info "Changing collation to ${MYSQL_COLLATION} ..."
-mysql $mysql_flags <<EOSQL
-      ALTER DATABASE \`${MYSQL_DATABASE}\` COLLATE \`${MYSQL_COLLATION}\` ;
-EOSQL
+    # the prebuilt data directory already includes the database
+    if ! ${MYSQL_DATADIR_PREBUILT} ; then
+      create_database
     fi
 
     if [ -v MYSQL_USER ]; then
@@ -177,23 +428,249 @@ EOSQL
   export MYSQL_DATADIR_FIRST_INIT=true
 }
 
-# The 'server_id' number for slave needs to be within 1-4294967295 range.
-# This function will take the 'hostname' if the container, hash it and turn it
-# into the number.
-# See: https://dev.mysql.com/doc/refman/en/replication-options.html#option_mysqld_server-id
-function server_id() {
-  checksum=$(sha256sum <<< $(hostname -I))
-  checksum=${checksum:0:14}
-  echo -n $((0x${checksum}%4294967295))
+# Prints the key of the prebuilt data directory, which changes whenever the seed
+# data files (names and contents), the server version or settings that influence
+# the initialized data change
+function prebuilt_datadir_key() {
+  {
+    mysqld_version
+    echo "${MYSQL_DATABASE:-} ${MYSQL_CHARSET:-} ${MYSQL_COLLATION:-} ${MYSQL_LOWER_CASE_TABLE_NAMES:-0}"
+    [ -d "${APP_DATA}/mysql-data" ] && ( cd "${APP_DATA}/mysql-data" && \
+      find . -maxdepth 1 -type f \( -name '*.sql' -o -name '*.csv' \) -print0 | sort -z | xargs -0 -r sha256sum ) || :
+  } | sha256sum | cut -d ' ' -f 1
 }
 
-function wait_for_mysql_master() {
-  while true; do
-    log_info "Waiting for MySQL master (${MYSQL_MASTER_SERVICE_NAME}) to accept connections ..."
-    mysqladmin --host=${MYSQL_MASTER_SERVICE_NAME} --user="${MYSQL_MASTER_USER}" \
-      --password="${MYSQL_MASTER_PASSWORD}" ping &>/dev/null && log_info "MySQL master is ready" && return 0
-    sleep 1
+# Initialize a data directory with the seed data during the s2i build, so containers
+# started from the application image only copy it instead of loading the seed data
+function prebuild_datadir() {
+  export_setting_variables
+  export MYSQL_DATADIR="${prebuilt_datadir_root}/$(prebuilt_datadir_key)"
+  log_info "Prebuilding data directory ${MYSQL_DATADIR} ..."
+  rm -rf "${prebuilt_datadir_root}"
+  mkdir -p "${MYSQL_DATADIR}"
+
+  source ${CONTAINER_SCRIPTS_PATH}/pre-init/30-base-config.sh
+  process_extending_config_files ${APP_DATA}/mysql-cfg/ ${CONTAINER_SCRIPTS_PATH}/cnf/
+  install_database
+  if [ -v MYSQL_DATABASE ]; then
+    create_database
+  fi
+  load_seed_data ${APP_DATA}/mysql-data
+  shutdown_local_mysql
+  rm -f /etc/my.cnf.d/*.cnf
+
+  /usr/libexec/fix-permissions "${prebuilt_datadir_root}"
+}
+
+# Copy the data directory prebuilt by the s2i build into the empty data directory
+# - only if it was built for the same seed data, server version and settings
+# - not when replicating, as the seed data would be missing in the binary log
+function copy_prebuilt_datadir() {
+  local prebuilt_datadir
+  [ -d "${prebuilt_datadir_root}" ] || return 1
+  if [ -v MYSQL_RUNNING_AS_MASTER ] || [ -v MYSQL_RUNNING_AS_SLAVE ]; then
+    return 1
+  fi
+  prebuilt_datadir="${prebuilt_datadir_root}/$(prebuilt_datadir_key)"
+  if ! [ -d "${prebuilt_datadir}" ]; then
+    log_info "The prebuilt data directory does not match the seed data or settings, not using it."
+    return 1
+  fi
+  log_info "Copying prebuilt data directory ${prebuilt_datadir} ..."
+  cp -R "${prebuilt_datadir}/." "${MYSQL_DATADIR}/"
+  export MYSQL_DATADIR_PREBUILT=true
+}
+
+# Prints the name of the mariabackup tool (it is called mariadb-backup in newer versions)
+function mariabackup_cmd() {
+  command -v mariadb-backup || command -v mariabackup
+}
+
+# Seed the empty data directory from a physical back-up created by mariabackup
+# - $1 is a directory with an extracted back-up, a file with a back-up stream
+#   (mbstream or tar, optionally compressed by gzip or xz) or '-' for
+#   reading the mbstream from the standard input
+# - the back-up is unpacked next to the data files, so that moving the prepared
+#   files into place does not need another copy
+function restore_database() {
+  local source="$1"
+  local restore_dir="${MYSQL_DATADIR}/.restore"
+  local parallel=${MYSQL_RESTORE_PARALLEL:-${NUMBER_OF_CORES:-1}}
+  local backup_tool use_memory decompress start
+  # A truncated or corrupt compressed back-up must fail the restore, not only
+  # the last command of the pipeline
+  local -
+  set -o pipefail
+  backup_tool=$(mariabackup_cmd) || { log_warn "mariabackup is not available, cannot restore the data directory." ; return 1 ; }
+  if [ -n "${NO_MEMORY_LIMIT:-}" -o -z "${MEMORY_LIMIT_IN_BYTES:-}" ]; then
+    use_memory=${MYSQL_RESTORE_USE_MEMORY:-100M}
+  else
+    # mysqld is not running yet, so most of the memory can be used for applying the redo log
+    use_memory=${MYSQL_RESTORE_USE_MEMORY:-$((MEMORY_LIMIT_IN_BYTES*75/1024/1024/100))M}
+  fi
+  start=$(date +%s)
+
+  log_info "Restoring data directory from ${source} ..."
+  rm -rf "${restore_dir}"
+  mkdir -p "${restore_dir}"
+  if [ -d "${source}" ]; then
+    cp -a "${source}/." "${restore_dir}"
+  else
+    case "${source}" in
+      *.gz|*.tgz)   decompress="gzip -dc" ;;
+      *.xz)         decompress="xz -dc -T ${parallel}" ;;
+      *.tar.*)      log_warn "Unknown compression of the back-up ${source}, expected gz or xz." ; return 1 ;;
+      *)            decompress="cat" ;;
+    esac
+    [ "${source}" == "-" ] && source=/dev/stdin
+    case "${source}" in
+      *.tar|*.tar.*|*.tgz) $decompress "${source}" | tar -xf - -C "${restore_dir}" ;;
+      *) $decompress "${source}" | mbstream -x --parallel=${parallel} -C "${restore_dir}" ;;
+    esac || { log_warn "Could not extract the back-up ${source}, it may be truncated or corrupt." ; return 1 ; }
+  fi
+
+  # back-ups taken with --compress include qpress compressed files
+  if [ -n "$(find "${restore_dir}" -name '*.qp' -print -quit)" ]; then
+    log_and_run ${backup_tool} --decompress --remove-original --parallel=${parallel} --target-dir="${restore_dir}"
+  fi
+  log_and_run ${backup_tool} --prepare --use-memory=${use_memory} --target-dir="${restore_dir}"
+
+  find "${restore_dir}" -mindepth 1 -maxdepth 1 -exec mv -t "${MYSQL_DATADIR}" {} +
+  rmdir "${restore_dir}"
+  log_info "Data directory restored in $(( $(date +%s) - start )) seconds"
+}
+
+# Load one seed data file using the session settings prepared by load_seed_data
+# - *.csv files are loaded into the table named after the file, the first line
+#   of the file lists the columns
+function load_seed_data_file() {
+  local file="$1"
+  local table columns
+  log_info "Loading seed data file ${file} ..."
+  case "${file}" in
+    *.sql)
+      { echo "${seed_data_session}" ; cat "${file}" ; echo "COMMIT;" ; } | mysql $mysql_flags ${MYSQL_DATABASE:-}
+      ;;
+    *.csv)
+      table=$(basename "${file}" .csv)
+      columns=$(head -n 1 "${file}" | tr -d '\r')
+mysql $mysql_flags --local-infile=1 "${MYSQL_DATABASE}" <<EOSQL
+      ${seed_data_session}
+      LOAD DATA LOCAL INFILE '${file}' INTO TABLE \`${table}\`
+        FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '"'
+        LINES TERMINATED BY '\n' IGNORE 1 LINES (${columns});
+      COMMIT;
+EOSQL
+      ;;
+  esac
+}
+
+# Load seed data (*.sql and *.csv files) from $1 into the MYSQL_DATABASE database
+# - files are loaded in alphabetical order, or by up to MYSQL_SEED_DATA_WORKERS
+#   parallel clients when it is set; *.csv files are loaded once all *.sql files
+#   (which usually create the tables) are done
+# - redo log flushing, binary logging (kept on master, so replicas get the data)
+#   and unique/foreign key checks are relaxed only for the time of the load
+function load_seed_data() {
+  local data_dir="$1"
+  local workers=${MYSQL_SEED_DATA_WORKERS:-1}
+  local seed_data_session="SET SESSION unique_checks=0; SET SESSION foreign_key_checks=0; SET SESSION autocommit=0;"
+  local flush_log_at_trx_commit file pid start status=0
+  local sql_files=() csv_files=() pids=()
+
+  [ -d "${data_dir}" ] || return 0
+  mapfile -t sql_files < <(find "${data_dir}" -maxdepth 1 -type f -name '*.sql' | sort)
+  mapfile -t csv_files < <(find "${data_dir}" -maxdepth 1 -type f -name '*.csv' | sort)
+  [ ${#sql_files[@]} -gt 0 ] || [ ${#csv_files[@]} -gt 0 ] || return 0
+  if [ ${#csv_files[@]} -gt 0 ] && ! [ -v MYSQL_DATABASE ]; then
+    log_warn "MYSQL_DATABASE is not set, *.csv files in ${data_dir} are not loaded."
+    csv_files=()
+  fi
+  if ! [ -v MYSQL_RUNNING_AS_MASTER ]; then
+    seed_data_session+=" SET SESSION sql_log_bin=0;"
+  fi
+
+  log_info "Loading seed data from ${data_dir} using ${workers} workers ..."
+  start=$(date +%s)
+  flush_log_at_trx_commit=$(mysql $mysql_flags -N -B -e 'SELECT @@GLOBAL.innodb_flush_log_at_trx_commit')
+  mysql $mysql_flags -e 'SET GLOBAL innodb_flush_log_at_trx_commit=0'
+
+  for file in "${sql_files[@]}" - "${csv_files[@]}"; do
+    if [ "${file}" == "-" ]; then
+      # all *.sql files need to be loaded before *.csv files
+      for pid in "${pids[@]}"; do
+        wait "${pid}" || status=1
+      done
+      pids=()
+      continue
+    fi
+    if [ ${#pids[@]} -ge "${workers}" ]; then
+      wait "${pids[0]}" || status=1
+      pids=("${pids[@]:1}")
+    fi
+    load_seed_data_file "${file}" &
+    pids+=($!)
+  done
+  for pid in "${pids[@]}"; do
+    wait "${pid}" || status=1
   done
+
+  mysql $mysql_flags -e "SET GLOBAL innodb_flush_log_at_trx_commit=${flush_log_at_trx_commit}"
+  if [ "${status}" -ne 0 ]; then
+    log_warn "Loading seed data from ${data_dir} failed."
+    return 1
+  fi
+  log_info "Seed data loaded in $(( $(date +%s) - start )) seconds"
+}
+
+# Print the statements creating the databases and users listed in the provisioning
+# file $1. Each line of the file is one of:
+#   database <name>
+#   user <name> <password> <database>[,<database>...] [<privileges>]
+# Every statement is idempotent, and the privileges of a listed user are revoked
+# before they are granted again, so applying them on each start reconciles the
+# databases, passwords and grants with the file.
+function provisioning_sql() {
+  local file=$1 kind name password databases privileges db line=0
+  # the last line is read also when the file does not end with a newline
+  while read -r kind name password databases privileges || [ -n "${kind}" ]; do
+    line=$(( line + 1 ))
+    case "${kind}" in
+      ''|\#*)
+        continue
+        ;;
+      database)
+        [[ "${name}" =~ $mysql_identifier_regex ]] || { log_warn "${file}:${line}: Invalid database name" >&2; return 1; }
+        echo "CREATE DATABASE IF NOT EXISTS \`${name}\`;"
+        ;;
+      user)
+        [[ "${name}" =~ $mysql_identifier_regex ]] || { log_warn "${file}:${line}: Invalid username" >&2; return 1; }
+        [[ "${password}" =~ $mysql_password_regex ]] || { log_warn "${file}:${line}: Invalid password" >&2; return 1; }
+        [[ "${privileges:-ALL}" =~ ^[A-Za-z_,\ ]+$ ]] || { log_warn "${file}:${line}: Invalid privileges" >&2; return 1; }
+        echo "CREATE USER IF NOT EXISTS '${name}'@'%' IDENTIFIED BY '${password}';"
+        echo "ALTER USER '${name}'@'%' IDENTIFIED BY '${password}';"
+        echo "REVOKE ALL PRIVILEGES, GRANT OPTION FROM '${name}'@'%';"
+        for db in ${databases//,/ }; do
+          [[ "${db}" =~ $mysql_identifier_regex ]] || { log_warn "${file}:${line}: Invalid database name" >&2; return 1; }
+          echo "GRANT ${privileges:-ALL} ON \`${db}\`.* TO '${name}'@'%';"
+        done
+        ;;
+      *)
+        log_warn "${file}:${line}: Unknown entry '${kind}', expected 'database' or 'user'" >&2
+        return 1
+        ;;
+    esac
+  done < "${file}"
+}
+
+# Apply the provisioning file $1 in a single client session
+function provision_databases() {
+  local file=$1 sql started=$(date +%s)
+  [ -f "${file}" ] || return 0
+  log_info "Provisioning databases and users from ${file} ..."
+  sql=$(provisioning_sql "${file}") || return 1
+  mysql $mysql_flags <<< "${sql}"
+  log_info "Provisioned $(grep -c '^CREATE DATABASE' <<< "${sql}") databases and $(grep -c '^CREATE USER' <<< "${sql}") users in $(( $(date +%s) - started )) seconds"
 }
 
 # get_matched_files finds file for image extending
@@ -209,17 +686,21 @@ function get_matched_files() {
 # process_extending_files process extending files in $1 and $2 directories
 # - source all *.sh files
 #   (if there are files with same name source only file from $1)
+# - skip the files from $2 listed in $3, hooks that have nothing to do in the
+#   current mode (a custom file with the same name is still sourced)
 function process_extending_files() {
-  local custom_dir default_dir
+  local custom_dir default_dir skipped_files
   custom_dir=$1
   default_dir=$2
+  skipped_files=" ${3:-} "
 
   while read filename ; do
-    echo "=> sourcing $filename ..."
     # Custom file is prefered
     if [ -f $custom_dir/$filename ]; then
+      echo "=> sourcing $filename ..."
       source $custom_dir/$filename
-    else
+    elif [[ "${skipped_files}" != *" ${filename} "* ]]; then
+      echo "=> sourcing $filename ..."
       source $default_dir/$filename
     fi
   done <<<"$(get_matched_files "$custom_dir" "$default_dir" '*.sh' | sort -u)"
@@ -3,46 +3,52 @@ password_change() {
 
   # Set the password for MySQL user and root everytime this container is started.
   # This allows to change the password by editing the deployment configuration.
+  # The current state is read by a single query and statements are only run for
+  # the accounts that differ from the environment variables.
+  local user_exists=0 user_current=0 root_exists=0 root_current=0 sql=
+  read -r user_exists user_current root_exists root_current <<< "$(mysql $mysql_flags -N -B <<EOSQL
+    SELECT
+      (SELECT COUNT(*) FROM mysql.user WHERE User='${MYSQL_USER:-}' AND Host='%'),
+      (SELECT COUNT(*) FROM mysql.user WHERE User='${MYSQL_USER:-}' AND Host='%'
+         AND Password=PASSWORD('${MYSQL_PASSWORD:-}')),
+      (SELECT COUNT(*) FROM mysql.user WHERE User='root' AND Host='%'),
+      (SELECT COUNT(*) FROM mysql.user WHERE User='root' AND Host='%'
+         AND Password=PASSWORD('${MYSQL_ROOT_PASSWORD:-}'))
+      -- the remote root needs every privilege of the local root, with grant option
+      * ((SELECT COUNT(*) FROM information_schema.USER_PRIVILEGES
+            WHERE GRANTEE='''root''@''%''' AND IS_GRANTABLE='YES')
+         = (SELECT COUNT(*) FROM information_schema.USER_PRIVILEGES
+            WHERE GRANTEE='''root''@''localhost''' AND IS_GRANTABLE='YES'));
+EOSQL
+)"
+
   if [[ -v MYSQL_USER && -v MYSQL_PASSWORD ]]; then
-    local user_maches=$(echo "SELECT COUNT(*) AS found FROM mysql.user WHERE user='${MYSQL_USER}' AND Host='%' \G" | mysql $mysql_flags)
-    if ! echo "${user_maches}" | grep -q 'found: 1' ; then
+    if [ "${user_exists}" != "1" ]; then
       log_info "WARNING: User ${MYSQL_USER} does not exist in database. Password not changed."
-    else
-mysql $mysql_flags <<EOSQL
-      ALTER USER '${MYSQL_USER}'@'%' IDENTIFIED BY '${MYSQL_PASSWORD}';
-EOSQL
+    elif [ "${user_current}" != "1" ]; then
+      log_info "Changing password for user ${MYSQL_USER} ..."
+      sql+="ALTER USER '${MYSQL_USER}'@'%' IDENTIFIED BY '${MYSQL_PASSWORD}';"$'\n'
     fi
   fi
 
   # The MYSQL_ROOT_PASSWORD is optional, therefore we need to either enable remote
   # access with a password if the variable is set or disable remote access otherwise.
   if [ -v MYSQL_ROOT_PASSWORD ]; then
-    # GRANT will create a user if it doesn't exist on 10.0 and lower, but we
-    # need to explicitly call CREATE USER in 10.1 and higher
-    # then set its password
-    if [ "$MYSQL_VERSION" \> "10.0" ] ; then
-mysql $mysql_flags <<EOSQL
-      CREATE USER IF NOT EXISTS 'root'@'%';
-EOSQL
+    if [ "${root_current}" != "1" ]; then
+      log_info "Setting password for remote access of MySQL root user ..."
+      sql+="CREATE USER IF NOT EXISTS 'root'@'%';"$'\n'
+      sql+="GRANT ALL PRIVILEGES ON *.* TO 'root'@'%' IDENTIFIED BY '${MYSQL_ROOT_PASSWORD}' WITH GRANT OPTION;"$'\n'
     fi
-mysql $mysql_flags <<EOSQL
-      GRANT ALL PRIVILEGES ON *.* TO 'root'@'%' IDENTIFIED BY '${MYSQL_ROOT_PASSWORD}' WITH GRANT OPTION;
-EOSQL
+  elif [ "${root_exists}" != "0" ]; then
+    log_info "Disabling remote access of MySQL root user ..."
+    sql+="DROP USER IF EXISTS 'root'@'%';"$'\n'
+  fi
+
+  # Account management statements take effect immediately, no FLUSH PRIVILEGES is needed
+  if [ -n "${sql}" ]; then
+    mysql $mysql_flags <<< "${sql}"
   else
-    if [ "$MYSQL_VERSION" \> "10.0" ] ; then
-mysql $mysql_flags <<EOSQL
-      DROP USER IF EXISTS 'root'@'%';
-      FLUSH PRIVILEGES;
-EOSQL
-    else
-      # In 10.0 and lower, We do GRANT and DROP USER to emulate a DROP USER IF EXISTS statement
-      # http://bugs.mysql.com/bug.php?id=19166
-mysql $mysql_flags <<EOSQL
-      GRANT USAGE ON *.* TO 'root'@'%';
-      DROP USER 'root'@'%';
-      FLUSH PRIVILEGES;
-EOSQL
-    fi
+    log_info 'Passwords are up to date'
   fi
 }
 
@@ -51,4 +57,3 @@ if ! [ -v MYSQL_RUNNING_AS_SLAVE ] ; then
 fi
 
 unset -f password_change
-
@@ -0,0 +1,6 @@
+# Create the databases and users listed in the provisioning file, on every start,
+# so the changes of the file are applied also to an existing data directory
+
+if ! [ -v MYSQL_RUNNING_AS_SLAVE ] ; then
+  provision_databases ${MYSQL_PROVISIONING_FILE:-${APP_DATA}/mysql-provisioning.conf}
+fi
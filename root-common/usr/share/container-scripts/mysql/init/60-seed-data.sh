@@ -0,0 +1,5 @@
+# Load seed data shipped in ${APP_DATA}/mysql-data into a freshly initialized database
+
+if ! [ -v MYSQL_RUNNING_AS_SLAVE ] && $MYSQL_DATADIR_FIRST_INIT && ! $MYSQL_DATADIR_PREBUILT ; then
+  load_seed_data ${APP_DATA}/mysql-data
+fi
@@ -8,16 +8,29 @@ function usage() {
   echo "  MYSQL_ROOT_PASSWORD (regex: '$mysql_password_regex')"
   echo "Or both."
   echo "Optional Settings:"
+  echo "  MYSQL_CHARSET (default: utf8mb4 or the character set of MYSQL_COLLATION)"
+  echo "  MYSQL_COLLATION (default: the default collation of MYSQL_CHARSET)"
   echo "  MYSQL_LOWER_CASE_TABLE_NAMES (default: 0)"
   echo "  MYSQL_LOG_QUERIES_ENABLED (default: 0)"
+  echo "  MYSQL_SLOW_QUERY_LOG (default: 0)"
+  echo "  MYSQL_LONG_QUERY_TIME (default: 1)"
   echo "  MYSQL_MAX_CONNECTIONS (default: 151)"
+  echo "  MYSQL_QUERY_CACHE_TYPE (default: OFF)"
+  echo "  MYSQL_QUERY_CACHE_SIZE (default: 16M)"
+  echo "  MYSQL_QUERY_CACHE_LIMIT (default: 1M)"
   echo "  MYSQL_FT_MIN_WORD_LEN (default: 4)"
   echo "  MYSQL_FT_MAX_WORD_LEN (default: 20)"
   echo "  MYSQL_AIO (default: 1)"
   echo "  MYSQL_KEY_BUFFER_SIZE (default: 32M or 10% of available memory)"
   echo "  MYSQL_MAX_ALLOWED_PACKET (default: 200M)"
-  echo "  MYSQL_TABLE_OPEN_CACHE (default: 400)"
+  echo "  MYSQL_TABLE_OPEN_CACHE (default: 400 or 120% of the tables in the data directory)"
+  echo "  MYSQL_TABLE_DEFINITION_CACHE (default: 400 or 110% of the tables in the data directory)"
+  echo "  MYSQL_TABLE_OPEN_CACHE_INSTANCES (default: number of CPU cores, at most 8)"
+  echo "  MYSQL_OPEN_FILES_LIMIT (default: calculated from the table cache and max connections)"
   echo "  MYSQL_SORT_BUFFER_SIZE (default: 256K)"
+  echo "  MYSQL_TMP_TABLE_SIZE (default: 16M or 2% of available memory, at most 256M)"
+  echo "  MYSQL_MAX_HEAP_TABLE_SIZE (default: MYSQL_TMP_TABLE_SIZE)"
+  echo "  MYSQL_TMPDIR (default: /tmp)"
   echo "  MYSQL_READ_BUFFER_SIZE (default: 8M or 5% of available memory)"
   echo "  MYSQL_INNODB_BUFFER_POOL_SIZE (default: 32M or 50% of available memory)"
   echo "  MYSQL_INNODB_LOG_FILE_SIZE (default: 8M or 15% of available memory)"
@@ -76,6 +89,32 @@ function validate_variables() {
   fi
 }
 
+function validate_charset_variables() {
+  [[ "$MYSQL_CHARSET" =~ $mysql_identifier_regex ]] || usage "Invalid character set"
+  if [ -n "${MYSQL_COLLATION:-}" ]; then
+    [[ "$MYSQL_COLLATION" =~ $mysql_identifier_regex ]] || usage "Invalid collation"
+    # utf8 is an alias of utf8mb3 and the collations use either of the names
+    local collation_charset=${MYSQL_COLLATION%%_*}
+    [[ "${collation_charset/#utf8mb3/utf8}" == "${MYSQL_CHARSET/#utf8mb3/utf8}" ]] || \
+      usage "Collation ${MYSQL_COLLATION} does not belong to the character set ${MYSQL_CHARSET}"
+  fi
+}
+
+function validate_tmpdir_variables() {
+  [ -d "${MYSQL_TMPDIR}" ] && [ -w "${MYSQL_TMPDIR}" ] || \
+    usage "MYSQL_TMPDIR ${MYSQL_TMPDIR} is not a writable directory"
+  # On-disk temporary tables and sort files should not compete with InnoDB for
+  # the I/O of the data volume
+  if [ "$(stat -f -c %T "${MYSQL_TMPDIR}")" == "tmpfs" ]; then
+    log_info "Using memory-backed ${MYSQL_TMPDIR} for temporary files, they count against the memory limit"
+  elif [ "$(stat -c %d "${MYSQL_TMPDIR}")" == "$(stat -c %d "${MYSQL_DATADIR}" 2>/dev/null)" ]; then
+    log_warn "MYSQL_TMPDIR ${MYSQL_TMPDIR} is on the data volume, temporary files will compete with the data for I/O"
+  fi
+}
+
 if ! [ -v MYSQL_RUNNING_AS_SLAVE ] ; then
   validate_variables
 fi
+
+validate_charset_variables
+validate_tmpdir_variables
@@ -16,6 +16,19 @@ function validate_replication_variables() {
   [[ "$MYSQL_MASTER_PASSWORD" =~ $mysql_password_regex   ]] || usage "Invalid MySQL master password"
 }
 
+function validate_binlog_variables() {
+  [[ "${MYSQL_BINLOG_FORMAT,,}" =~ ^(statement|row|mixed)$ ]] || usage "Invalid binlog format, expected statement, row or mixed"
+  [[ "${MYSQL_BINLOG_ROW_IMAGE,,}" =~ ^(full|minimal|noblob)$ ]] || usage "Invalid binlog row image, expected FULL, MINIMAL or NOBLOB"
+  [[ "${MYSQL_BINLOG_COMPRESS^^}" =~ ^(0|1|ON|OFF)$ ]] || usage "Invalid binlog compression, expected ON or OFF"
+  [[ "${MYSQL_BINLOG_CACHE_SIZE}" =~ ^[0-9]+[KMG]?$ ]] || usage "Invalid binlog cache size"
+  [[ "${MYSQL_MAX_BINLOG_SIZE}" =~ ^[0-9]+[KMG]?$ ]] || usage "Invalid maximum binlog size"
+  [[ "${MYSQL_BINLOG_EXPIRE_LOGS_SECONDS}" =~ ^[0-9]+$ ]] || usage "Invalid binlog expiry, expected a number of seconds"
+  [[ "${MYSQL_SLAVE_PARALLEL_THREADS}" =~ ^[0-9]+$ ]] || usage "Invalid number of replica parallel threads"
+  [[ "${MYSQL_SLAVE_PARALLEL_MODE,,}" =~ ^(conservative|optimistic|aggressive|minimal|none)$ ]] || \
+    usage "Invalid replica parallel mode, expected conservative, optimistic, aggressive, minimal or none"
+}
+
 if [ -v MYSQL_RUNNING_AS_MASTER ] || [ -v MYSQL_RUNNING_AS_SLAVE ] ; then
   validate_replication_variables
+  validate_binlog_variables
 fi
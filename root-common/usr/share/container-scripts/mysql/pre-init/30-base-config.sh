@@ -1,3 +1,60 @@
 log_info 'Processing basic MySQL configuration files ...'
 envsubst < ${CONTAINER_SCRIPTS_PATH}/pre-init/my-base.cnf.template > /etc/my.cnf.d/base.cnf
 
+log_info 'Processing character set configuration ...'
+envsubst < ${CONTAINER_SCRIPTS_PATH}/pre-init/my-charset.cnf.template > /etc/my.cnf.d/charset.cnf
+if [ -n "${MYSQL_COLLATION:-}" ]; then
+  echo "collation_server     = ${MYSQL_COLLATION}" >> /etc/my.cnf.d/charset.cnf
+fi
+
+case "${MYSQL_PERFORMANCE_SCHEMA,,}" in
+  statements)
+    log_info 'Processing performance_schema configuration for statement digests ...'
+    envsubst < ${CONTAINER_SCRIPTS_PATH}/pre-init/my-performance-schema.cnf.template > /etc/my.cnf.d/performance-schema.cnf
+    ;;
+  off)
+    rm -f /etc/my.cnf.d/performance-schema.cnf
+    ;;
+  *)
+    log_warn "Unknown MYSQL_PERFORMANCE_SCHEMA value '${MYSQL_PERFORMANCE_SCHEMA}', performance_schema left disabled"
+    rm -f /etc/my.cnf.d/performance-schema.cnf
+    ;;
+esac
+
+case "${MYSQL_THREAD_HANDLING}" in
+  pool-of-threads)
+    log_info 'Processing thread pool configuration ...'
+    envsubst < ${CONTAINER_SCRIPTS_PATH}/pre-init/my-thread-pool.cnf.template > /etc/my.cnf.d/thread-pool.cnf
+    ;;
+  one-thread-per-connection)
+    rm -f /etc/my.cnf.d/thread-pool.cnf
+    ;;
+  *)
+    log_warn "Unknown MYSQL_THREAD_HANDLING value '${MYSQL_THREAD_HANDLING}', using one thread per connection"
+    rm -f /etc/my.cnf.d/thread-pool.cnf
+    ;;
+esac
+
+# The query cache serializes the queries on a single mutex, so it is not enabled
+# where many connections or CPUs would contend for it
+query_cache_max_connections=200
+query_cache_max_cores=4
+case "${MYSQL_QUERY_CACHE_TYPE^^}" in
+  ON|DEMAND)
+    if [ ${MYSQL_MAX_CONNECTIONS} -gt ${query_cache_max_connections} ] || [ ${NUMBER_OF_CORES:-1} -gt ${query_cache_max_cores} ]; then
+      log_warn "Query cache left disabled, ${MYSQL_MAX_CONNECTIONS} connections on ${NUMBER_OF_CORES:-1} CPUs would contend for it" \
+               "(at most ${query_cache_max_connections} connections and ${query_cache_max_cores} CPUs)"
+      rm -f /etc/my.cnf.d/query-cache.cnf
+    else
+      log_info 'Processing query cache configuration ...'
+      envsubst < ${CONTAINER_SCRIPTS_PATH}/pre-init/my-query-cache.cnf.template > /etc/my.cnf.d/query-cache.cnf
+    fi
+    ;;
+  OFF)
+    rm -f /etc/my.cnf.d/query-cache.cnf
+    ;;
+  *)
+    log_warn "Unknown MYSQL_QUERY_CACHE_TYPE value '${MYSQL_QUERY_CACHE_TYPE}', query cache left disabled"
+    rm -f /etc/my.cnf.d/query-cache.cnf
+    ;;
+esac
@@ -8,6 +8,12 @@ fi
 if [ -v MYSQL_RUNNING_AS_MASTER ] ; then
   log_info 'Processing basic MySQL configuration for replication (master only) files ...'
   envsubst < ${CONTAINER_SCRIPTS_PATH}/pre-init/my-master.cnf.template > /etc/my.cnf.d/master.cnf
+  # The binlog expiry is set in seconds since 10.6, older versions only take days
+  if [ "$(mysqld_compat_version)" -ge 1006 ]; then
+    echo "binlog_expire_logs_seconds = ${MYSQL_BINLOG_EXPIRE_LOGS_SECONDS}" >> /etc/my.cnf.d/master.cnf
+  else
+    echo "expire_logs_days = $(( (MYSQL_BINLOG_EXPIRE_LOGS_SECONDS + 86399) / 86400 ))" >> /etc/my.cnf.d/master.cnf
+  fi
 fi
 
 if [ -v MYSQL_RUNNING_AS_SLAVE ] ; then
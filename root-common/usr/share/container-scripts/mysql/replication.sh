@@ -0,0 +1,63 @@
+#!/bin/bash
+
+# Helpers of the replica entrypoint, sourced after common.sh
+
+# File in the datadir with the server-id of this replica, so it keeps the same
+# id across restarts even when the pod gets a new IP address
+server_id_file=${MYSQL_DATADIR}/mysql_server_id
+
+# The 'server_id' number for slave needs to be within 1-4294967295 range.
+# The id stored in the datadir by a previous run is reused. Otherwise the ordinal
+# of the pod (MYSQL_REPLICA_ORDINAL, or the numeric suffix of the StatefulSet pod
+# hostname) is used, shifted by 2 since 1 is the id of the master. When neither is
+# available, the 'hostname' of the container is hashed and turned into the number.
+# See: https://dev.mysql.com/doc/refman/en/replication-options.html#option_mysqld_server-id
+function server_id() {
+  local ordinal=${MYSQL_REPLICA_ORDINAL:-}
+  if [ -s ${server_id_file} ]; then
+    cat ${server_id_file}
+    return
+  fi
+  if [ -z "${ordinal}" ] && [[ "$(hostname)" =~ -([0-9]+)$ ]]; then
+    ordinal=${BASH_REMATCH[1]}
+  fi
+  if [ -n "${ordinal}" ]; then
+    echo -n $((ordinal + 2))
+    return
+  fi
+  checksum=$(sha256sum <<< $(hostname -I))
+  checksum=${checksum:0:14}
+  echo -n $((0x${checksum}%4294967295))
+}
+
+# Refuse to start when another replica of the master already uses our
+# server-id, and store the id in the datadir once it is known to be unique.
+# A replica registers itself with its first IP address as the report host. An id
+# already stored is not checked again, the master may still list the previous
+# connection of this replica under its old address.
+function check_server_id() {
+  local hosts
+  [ "$(cat ${server_id_file} 2>/dev/null)" == "${MYSQL_SERVER_ID}" ] && return 0
+  if ! hosts=$(mysql --host ${MYSQL_MASTER_SERVICE_NAME} -u"${MYSQL_MASTER_USER}" -p"${MYSQL_MASTER_PASSWORD}" \
+                 -N -B -e 'SHOW SLAVE HOSTS' 2>/dev/null); then
+    log_warn "Could not list the replicas of the MySQL master, the server-id ${MYSQL_SERVER_ID} was not checked"
+    return 0
+  fi
+  if awk -v id="${MYSQL_SERVER_ID}" -v host="$(hostname -I)" '
+       BEGIN { split(host, ip, " ") }
+       $1 == id && $2 != ip[1] { found = 1 }
+       END { exit !found }' <<< "${hosts}"; then
+    log_warn "The server-id ${MYSQL_SERVER_ID} is already used by another replica of the MySQL master"
+    return 1
+  fi
+  echo -n ${MYSQL_SERVER_ID} > ${server_id_file}
+}
+
+function wait_for_mysql_master() {
+  while true; do
+    log_info "Waiting for MySQL master (${MYSQL_MASTER_SERVICE_NAME}) to accept connections ..."
+    mysqladmin --host=${MYSQL_MASTER_SERVICE_NAME} --user="${MYSQL_MASTER_USER}" \
+      --password="${MYSQL_MASTER_PASSWORD}" ping &>/dev/null && log_info "MySQL master is ready" && return 0
+    sleep 1
+  done
+}
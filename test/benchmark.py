@@ -0,0 +1,512 @@
+#!/usr/bin/env python3
+"""
+SQL throughput and latency benchmark of the image with its tuning defaults.
+
+The image is started with every scenario (memory limit, CPUs and MYSQL_* settings),
+a table is filled and sysbench-like OLTP workloads are run against it by
+concurrent clients. The transactions per second and the p50/p99 latencies of
+the committed transactions, and the number of the failed ones (e.g. deadlocks), are
+written to a JSON file and compared with a stored baseline, so a change of the
+tuning defaults that makes the image slower is flagged.
+
+Every client is a 'mysql' process in the container fed through 'podman exec',
+so no database driver is needed on the host. The latency therefore includes
+the round trip through the pipe, which is the same for all the image versions.
+
+With --replication, a master and a replica are started for every replication
+scenario (binlog format and replica parallelism) instead. The write workloads
+run on the master while the apply lag of the replica is sampled every second,
+and the time the replica needs to catch up after the writes stop is measured.
+
+Usage: IMAGE_NAME=... python3 benchmark.py [--replication] [--baseline FILE] [--output FILE]
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+
+from container_ci_suite.container_lib import ContainerTestLib
+
+from polling import wait_for
+from polling import wait_for_log
+
+TABLE_SIZE = 100000
+END_MARKER = "benchmark-transaction-done"
+
+# Scenarios the image is started with, extend the list to cover new settings
+SCENARIOS = [
+    {"name": "512m-defaults", "memory": "512m", "env": {}},
+    {"name": "1g-defaults", "memory": "1g", "env": {}},
+    {"name": "2g-defaults", "memory": "2g", "env": {}},
+    {
+        "name": "1g-thread-pool",
+        "memory": "1g",
+        "env": {"MYSQL_THREAD_HANDLING": "pool-of-threads"},
+    },
+    # The query cache trade-off: hits on the reads against the mutex contention
+    # and the invalidations by the writes
+    {"name": "1g-2cpu-defaults", "memory": "1g", "cpus": "0-1", "env": {}},
+    {
+        "name": "1g-2cpu-query-cache",
+        "memory": "1g",
+        "cpus": "0-1",
+        "env": {"MYSQL_QUERY_CACHE_TYPE": "ON"},
+    },
+]
+
+# Master and replica settings of the replication scenarios
+REPLICATION_SCENARIOS = [
+    {
+        "name": f"{binlog_format}-{threads}-threads",
+        "memory": "1g",
+        "master_env": {"MYSQL_BINLOG_FORMAT": binlog_format},
+        "slave_env": {
+            "MYSQL_SLAVE_PARALLEL_THREADS": threads,
+            "MYSQL_SLAVE_PARALLEL_MODE": "optimistic" if threads else "conservative",
+        },
+    }
+    for binlog_format in ("statement", "row")
+    for threads in (0, 4)
+]
+REPLICATION_WORKLOADS = ["read_write", "insert"]
+REPLICATION_ARGS = [
+    "-e MYSQL_MASTER_USER=master",
+    "-e MYSQL_MASTER_PASSWORD=master",
+    "-e MYSQL_DATABASE=db",
+    "-e MYSQL_ROOT_PASSWORD=benchmark",
+]
+
+# Results where a higher or a lower value than the baseline is a regression
+HIGHER_IS_WORSE = ["p99_ms", "p99_lag_transactions", "catch_up_seconds"]
+LOWER_IS_WORSE = ["tps"]
+
+
+def point_select(rng):
+    return [f"SELECT c FROM sbtest WHERE id = {rng.randint(1, TABLE_SIZE)};"]
+
+
+def range_selects(rng):
+    start = rng.randint(1, TABLE_SIZE - 100)
+    end = start + 99
+    return [
+        f"SELECT c FROM sbtest WHERE id BETWEEN {start} AND {end};",
+        f"SELECT SUM(k) FROM sbtest WHERE id BETWEEN {start} AND {end};",
+        f"SELECT c FROM sbtest WHERE id BETWEEN {start} AND {end} ORDER BY c;",
+        f"SELECT DISTINCT c FROM sbtest WHERE id BETWEEN {start} AND {end} ORDER BY c;",
+    ]
+
+
+def read_only(rng):
+    statements = [stmt for _ in range(10) for stmt in point_select(rng)]
+    return ["BEGIN;"] + statements + range_selects(rng) + ["COMMIT;"]
+
+
+def read_write(rng):
+    row = rng.randint(1, TABLE_SIZE)
+    writes = [
+        f"UPDATE sbtest SET k = k + 1 WHERE id = {rng.randint(1, TABLE_SIZE)};",
+        f"UPDATE sbtest SET c = '{rng.getrandbits(64):020}' WHERE id = {rng.randint(1, TABLE_SIZE)};",
+        f"DELETE FROM sbtest WHERE id = {row};",
+        f"INSERT INTO sbtest (id, k, c, pad) VALUES ({row}, {rng.randint(1, TABLE_SIZE)}, 'c', 'pad');",
+    ]
+    return read_only(rng)[:-1] + writes + ["COMMIT;"]
+
+
+def insert(rng):
+    return [
+        (
+            f"INSERT INTO sbtest (k, c, pad) VALUES ({rng.randint(1, TABLE_SIZE)}, "
+            f"'{rng.getrandbits(64):020}', 'pad');"
+        )
+    ]
+
+
+WORKLOADS = {
+    "point_select": point_select,
+    "read_only": read_only,
+    "read_write": read_write,
+    "insert": insert,
+}
+
+
+class Client:
+    """
+    A client session running the transactions through the mysql client in the container.
+
+    The client keeps going after a failed statement, its error messages are read
+    from the same pipe as the results, so the failed transactions are detected.
+    """
+
+    def __init__(self, cid):
+        self.process = subprocess.Popen(
+            [
+                "podman",
+                "exec",
+                "-i",
+                cid,
+                "mysql",
+                "-uroot",
+                "-N",
+                "-B",
+                "--unbuffered",
+                "--force",
+                "sbtest",
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+        )
+
+    def run(self, statements):
+        """
+        Run the statements and return the seconds until the client answered all of them
+        and whether any of the statements failed.
+        """
+        failed = False
+        started = time.perf_counter()
+        self.process.stdin.write("\n".join(statements) + f"\nSELECT '{END_MARKER}';\n")
+        self.process.stdin.flush()
+        for line in self.process.stdout:
+            if line.startswith("ERROR "):
+                failed = True
+            elif line.strip() == END_MARKER:
+                return time.perf_counter() - started, failed
+        raise RuntimeError("The mysql client exited during the benchmark")
+
+    def close(self):
+        self.process.stdin.close()
+        self.process.wait()
+
+
+def percentile(values, share):
+    """
+    Return the value below which the share (0-1) of the sorted values falls.
+    """
+    index = min(len(values) - 1, int(share * len(values)))
+    return values[index]
+
+
+def run_workload(cid, workload, clients, duration):
+    """
+    Run the workload with concurrent clients for duration seconds and return the results.
+    """
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def client_loop(seed):
+        nonlocal errors
+        rng = random.Random(seed)
+        client = Client(cid)
+        measured = []
+        failures = 0
+        try:
+            while time.monotonic() < deadline:
+                seconds, failed = client.run(WORKLOADS[workload](rng))
+                if failed:
+                    failures += 1
+                else:
+                    measured.append(seconds)
+        finally:
+            client.close()
+        with lock:
+            latencies.extend(measured)
+            errors += failures
+
+    threads = [
+        threading.Thread(target=client_loop, args=(seed,)) for seed in range(clients)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    latencies.sort()
+    return {
+        "transactions": len(latencies),
+        "errors": errors,
+        "tps": round(len(latencies) / duration, 2),
+        # no latency when every transaction failed, the errors are still reported
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3) if latencies else None,
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3) if latencies else None,
+    }
+
+
+def query(cid, sql):
+    """
+    Run the SQL as the local root user and return the output without column names.
+    """
+    return subprocess.run(
+        ["podman", "exec", cid, "mysql", "-uroot", "-N", "-B", "-e", sql],
+        check=True,
+        stdout=subprocess.PIPE,
+        text=True,
+    ).stdout.strip()
+
+
+def gtid_seq(pos):
+    """
+    Return the number of transactions in a GTID position like 0-1-42.
+    """
+    return sum(int(gtid.rsplit("-", 1)[1]) for gtid in pos.split(",") if gtid)
+
+
+def prepare(cid):
+    """
+    Create and fill the benchmark table.
+    """
+    sql = (
+        "CREATE DATABASE sbtest; USE sbtest; "
+        "CREATE TABLE sbtest (id INT AUTO_INCREMENT PRIMARY KEY, k INT NOT NULL DEFAULT 0, "
+        "c CHAR(120) NOT NULL DEFAULT '', pad CHAR(60) NOT NULL DEFAULT '', KEY k (k)); "
+        "INSERT INTO sbtest (id, k, c, pad) SELECT seq, FLOOR(1 + RAND() * "
+        f"{TABLE_SIZE}), MD5(seq), MD5(-seq) FROM seq_1_to_{TABLE_SIZE}; "
+        "ANALYZE TABLE sbtest;"
+    )
+    query(cid, sql)
+
+
+def server_ready(cid):
+    """
+    Return whether the readiness probe of the server passes.
+    """
+    probe = subprocess.run(
+        ["podman", "exec", cid, "mysqld-probe", "readiness"],
+        check=False,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    return probe.returncode == 0
+
+
+def start_server(lib, name, container_args, **kwargs):
+    """
+    Start a container and return its cid once the server accepts the clients.
+    """
+    assert lib.create_container(
+        cid_file_name=name, container_args=container_args, **kwargs
+    )
+    cid = lib.get_cid(cid_file_name=name)
+    wait_for_log(cid, "Running final exec")
+    wait_for(lambda: server_ready(cid), message=f"the {name} server to be ready")
+    return cid
+
+
+def env_args(env):
+    return [f"-e {name}={value}" for name, value in env.items()]
+
+
+def run_scenario(image_name, scenario, workloads, clients, duration):
+    """
+    Start the image with the scenario settings and return the results of the workloads.
+    """
+    lib = ContainerTestLib(image_name=image_name, db_type="mariadb")
+    container_args = [
+        f"--memory={scenario['memory']}",
+        "-e MYSQL_ROOT_PASSWORD=benchmark",
+    ] + env_args(scenario["env"])
+    if "cpus" in scenario:
+        container_args.append(f"--cpuset-cpus={scenario['cpus']}")
+    try:
+        cid = start_server(lib, scenario["name"], container_args)
+        prepare(cid)
+        results = {}
+        for workload in workloads:
+            results[workload] = run_workload(cid, workload, clients, duration)
+            print(f"{scenario['name']} {workload}: {results[workload]}", flush=True)
+        return results
+    finally:
+        lib.cleanup()
+
+
+def run_replication_workload(master_cid, slave_cid, workload, clients, duration):
+    """
+    Run the workload on the master while sampling the replica apply lag, then
+    measure how long the replica needs to apply the rest.
+    """
+    lags = []
+    seconds_behind = []
+    writing = threading.Event()
+    writing.set()
+
+    def sample_lag():
+        while writing.is_set():
+            master_seq = gtid_seq(query(master_cid, "SELECT @@gtid_binlog_pos"))
+            status = query(slave_cid, "SHOW SLAVE STATUS\\G")
+            slave_seq = gtid_seq(query(slave_cid, "SELECT @@gtid_slave_pos"))
+            lags.append(max(0, master_seq - slave_seq))
+            for line in status.splitlines():
+                name, _, value = line.strip().partition(": ")
+                if name == "Seconds_Behind_Master" and value.isdigit():
+                    seconds_behind.append(int(value))
+            time.sleep(1)
+
+    sampler = threading.Thread(target=sample_lag)
+    sampler.start()
+    try:
+        results = run_workload(master_cid, workload, clients, duration)
+    finally:
+        writing.clear()
+        sampler.join()
+
+    # MASTER_GTID_WAIT() returns once the replica applied the final master position
+    master_pos = query(master_cid, "SELECT @@gtid_binlog_pos")
+    started = time.monotonic()
+    query(slave_cid, f"SELECT MASTER_GTID_WAIT('{master_pos}', 3600)")
+    lags.sort()
+    results.update(
+        {
+            "max_lag_transactions": lags[-1] if lags else 0,
+            "p99_lag_transactions": percentile(lags, 0.99) if lags else 0,
+            "max_seconds_behind_master": max(seconds_behind, default=0),
+            "catch_up_seconds": round(time.monotonic() - started, 3),
+        }
+    )
+    return results
+
+
+def run_replication_scenario(image_name, scenario, workloads, clients, duration):
+    """
+    Start a master and a replica with the scenario settings and return the
+    results of the workloads.
+    """
+    lib = ContainerTestLib(image_name=image_name, db_type="mariadb")
+    memory = f"--memory={scenario['memory']}"
+    try:
+        master_cid = start_server(
+            lib,
+            f"{scenario['name']}-master",
+            [memory] + REPLICATION_ARGS + env_args(scenario["master_env"]),
+            command="run-mysqld-master",
+        )
+        master_ip = lib.get_cip(cid_file_name=f"{scenario['name']}-master")
+        slave_cid = start_server(
+            lib,
+            f"{scenario['name']}-slave",
+            [memory, f"-e MYSQL_MASTER_SERVICE_NAME={master_ip}"]
+            + REPLICATION_ARGS
+            + env_args(scenario["slave_env"]),
+            command="run-mysqld-slave",
+        )
+        prepare(master_cid)
+        query(
+            slave_cid,
+            f"SELECT MASTER_GTID_WAIT('{query(master_cid, 'SELECT @@gtid_binlog_pos')}', 3600)",
+        )
+        results = {}
+        for workload in workloads:
+            results[workload] = run_replication_workload(
+                master_cid, slave_cid, workload, clients, duration
+            )
+            print(f"{scenario['name']} {workload}: {results[workload]}", flush=True)
+        return results
+    finally:
+        lib.cleanup()
+
+
+def compare(results, baseline, tolerance):
+    """
+    Return the descriptions of the results that are worse than the baseline by more than tolerance.
+    """
+    regressions = []
+    for scenario, workloads in baseline.items():
+        for workload, expected in workloads.items():
+            measured = results.get(scenario, {}).get(workload)
+            if measured is None:
+                continue
+            for key in LOWER_IS_WORSE:
+                if (
+                    expected.get(key) is not None
+                    and measured.get(key) is not None
+                    and measured[key] < expected[key] * (1 - tolerance)
+                ):
+                    regressions.append(
+                        f"{scenario} {workload}: {key} {measured[key]}, baseline {expected[key]}"
+                    )
+            for key in HIGHER_IS_WORSE:
+                if (
+                    expected.get(key) is not None
+                    and measured.get(key) is not None
+                    and measured[key] > expected[key] * (1 + tolerance)
+                ):
+                    regressions.append(
+                        f"{scenario} {workload}: {key} {measured[key]}, baseline {expected[key]}"
+                    )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--output", default="benchmark-results.json", help="JSON file for the results"
+    )
+    parser.add_argument(
+        "--baseline", help="JSON results of a previous run to compare with"
+    )
+    parser.add_argument(
+        "--tolerance", type=float, default=0.10, help="allowed relative regression"
+    )
+    parser.add_argument(
+        "--duration", type=int, default=60, help="seconds every workload runs"
+    )
+    parser.add_argument(
+        "--clients", type=int, default=8, help="number of concurrent clients"
+    )
+    parser.add_argument(
+        "--scenario", action="append", help="run only the named scenarios"
+    )
+    parser.add_argument(
+        "--replication",
+        action="store_true",
+        help="measure the replica lag of master/replica pairs",
+    )
+    parser.add_argument(
+        "--workload",
+        action="append",
+        choices=WORKLOADS,
+        help="run only the named workloads",
+    )
+    args = parser.parse_args()
+
+    image_name = os.environ["IMAGE_NAME"]
+    if args.replication:
+        all_scenarios, all_workloads = REPLICATION_SCENARIOS, REPLICATION_WORKLOADS
+        runner = run_replication_scenario
+    else:
+        all_scenarios, all_workloads = SCENARIOS, list(WORKLOADS)
+        runner = run_scenario
+    scenarios = [
+        s for s in all_scenarios if not args.scenario or s["name"] in args.scenario
+    ]
+    results = {
+        scenario["name"]: runner(
+            image_name,
+            scenario,
+            args.workload or all_workloads,
+            args.clients,
+            args.duration,
+        )
+        for scenario in scenarios
+    }
+    with open(args.output, "w") as output:
+        json.dump(results, output, indent=2, sort_keys=True)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as baseline:
+            regressions = compare(results, json.load(baseline), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
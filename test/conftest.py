@@ -1,11 +1,18 @@
 import os
 import sys
+import uuid
+
+import pytest
 
 from pathlib import Path
 from collections import namedtuple
 
+from container_ci_suite.container_lib import ContainerTestLib
+from container_ci_suite.engines.podman_wrapper import PodmanCLIWrapper
 from container_ci_suite.utils import check_variables
 
+from polling import wait_for
+
 if not check_variables():
     sys.exit(1)
 
@@ -35,6 +42,7 @@ Vars = namedtuple(
         "VERY_LONG_USER_NAME",
         "SSL_OPTION",
         "PREVIOUS_VERSION",
+        "WORKER",
     ],
 )
 VERSION = os.getenv("VERSION")
@@ -46,6 +54,9 @@ VERY_LONG_USER_NAME = "very_long_user_name_" + "x" * 40
 # so tests may require this option for compatibility.
 # https://mariadb.org/mission-impossible-zero-configuration-ssl/
 SSL_OPTION = "--disable-ssl-verify-server-cert" if VERSION == "11.8" else ""
+# Name of the pytest-xdist worker, used to keep the images, containers and
+# directories of the parallel workers apart
+WORKER = os.getenv("PYTEST_XDIST_WORKER", "main")
 VARS = Vars(
     OS=OS,
     VERSION=VERSION,
@@ -57,4 +68,118 @@ VARS = Vars(
     VERY_LONG_USER_NAME=VERY_LONG_USER_NAME,
     SSL_OPTION=SSL_OPTION,  # used for tests that require SSL verification to be disabled
     PREVIOUS_VERSION=MARIADB_PREVIOUS_VERSIONS.get(VERSION),
+    WORKER=WORKER,
+)
+
+# A running server shared by the tests, 'lib' is the ContainerTestLib owning it
+Server = namedtuple("Server", ["lib", "cip", "cid"])
+# A master and a replica replicating from it
+ReplicationPair = namedtuple("ReplicationPair", ["master", "slave"])
+
+SHARED_USER = "user"
+SHARED_PASSWORD = "foo"
+SHARED_ROOT_PASSWORD = "root"
+REPLICATION_ARGS = (
+    "-e MYSQL_MASTER_USER=master -e MYSQL_MASTER_PASSWORD=master -e MYSQL_DATABASE=db"
 )
+
+
+def start_server(lib, cid_file_name, container_args, **kwargs):
+    """
+    Create a container and wait until it accepts the connections.
+    """
+    assert lib.create_container(
+        cid_file_name=cid_file_name, container_args=container_args, **kwargs
+    )
+    cip, cid = lib.get_cip_cid(cid_file_name=cid_file_name)
+    assert cip, cid
+    assert lib.test_db_connection(
+        container_ip=cip, username="root", password=SHARED_ROOT_PASSWORD
+    )
+    return Server(lib=lib, cip=cip, cid=cid)
+
+
+def root_sql(server, sql_cmd):
+    """
+    Run the SQL statements as the local root user of the server.
+    """
+    return PodmanCLIWrapper.podman_exec_shell_command(
+        cid_file_name=server.cid,
+        cmd=f"mysql -uroot -e '{sql_cmd}'",
+    )
+
+
+def create_test_database(server):
+    """
+    Create a database of its own for a test, the shared user gets all privileges on it.
+    """
+    name = f"test_{uuid.uuid4().hex[:12]}"
+    root_sql(server, f"CREATE DATABASE {name}; GRANT ALL ON {name}.* TO {SHARED_USER};")
+    return name
+
+
+@pytest.fixture(scope="session")
+def mariadb_server():
+    """
+    A server shared by the tests that only run SQL or inspect the running server.
+    Tests changing data should do it in the database of the mariadb_database fixture.
+    """
+    lib = ContainerTestLib(image_name=VARS.IMAGE_NAME, db_type="mariadb")
+    yield start_server(
+        lib,
+        cid_file_name="shared_server",
+        container_args=[
+            f"-e MYSQL_USER={SHARED_USER}",
+            f"-e MYSQL_PASSWORD={SHARED_PASSWORD}",
+            "-e MYSQL_DATABASE=db",
+            f"-e MYSQL_ROOT_PASSWORD={SHARED_ROOT_PASSWORD}",
+            "-e MYSQL_METRICS_PORT=9104",
+        ],
+    )
+    lib.cleanup()
+
+
+@pytest.fixture
+def mariadb_database(mariadb_server):
+    """
+    The name of a new database in the shared server, dropped after the test.
+    """
+    name = create_test_database(mariadb_server)
+    yield name
+    root_sql(mariadb_server, f"DROP DATABASE {name};")
+
+
+@pytest.fixture(scope="session")
+def mariadb_replication():
+    """
+    A master and a replica shared by the replication tests.
+    """
+    lib = ContainerTestLib(image_name=VARS.IMAGE_NAME, db_type="mariadb")
+    master = start_server(
+        lib,
+        cid_file_name="shared_master",
+        container_args=[
+            f"-e MYSQL_USER={SHARED_USER}",
+            f"-e MYSQL_PASSWORD={SHARED_PASSWORD}",
+            f"-e MYSQL_ROOT_PASSWORD={SHARED_ROOT_PASSWORD}",
+        ],
+        docker_args=REPLICATION_ARGS,
+        command="mysqld-master",
+    )
+    slave = start_server(
+        lib,
+        cid_file_name="shared_slave",
+        container_args=[
+            f"-e MYSQL_MASTER_SERVICE_NAME={master.cip}",
+            "-e MYSQL_REPLICA_ORDINAL=3",
+        ],
+        docker_args=REPLICATION_ARGS,
+        command="mysqld-slave",
+    )
+    wait_for(
+        lambda: slave.cip in root_sql(master, "SHOW SLAVE HOSTS;"),
+        timeout=30,
+        message="the master to see the replica",
+    )
+    yield ReplicationPair(master=master, slave=slave)
+    lib.cleanup()
@@ -0,0 +1,65 @@
+import time
+
+from container_ci_suite.engines.podman_wrapper import PodmanCLIWrapper
+
+
+def wait_for(condition, timeout=60, interval=0.2, max_interval=3, message=None):
+    """
+    Call condition until it returns a true value and return that value.
+    The pause between the calls starts at interval and doubles up to max_interval,
+    AssertionError is raised when the condition does not hold within timeout seconds.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        result = condition()
+        if result:
+            return result
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise AssertionError(
+                f"Timed out after {timeout} seconds waiting for {message or condition}"
+            )
+        time.sleep(min(interval, remaining))
+        interval = min(interval * 2, max_interval)
+
+
+def wait_for_log(cid, text, timeout=120):
+    """
+    Wait until the logs of the container contain the text and return the logs.
+    """
+
+    def logs_with_text():
+        logs = PodmanCLIWrapper.podman_logs(container_id=cid)
+        return logs if text in logs else None
+
+    return wait_for(
+        logs_with_text, timeout=timeout, message=f"'{text}' in the logs of {cid}"
+    )
+
+
+def wait_for_replica(master_cid, slave_cid, timeout=60):
+    """
+    Wait until the replica applied all the transactions the master has written.
+    """
+    master_pos = PodmanCLIWrapper.podman_exec_shell_command(
+        cid_file_name=master_cid,
+        cmd="mysql -uroot -N -B -e 'SELECT @@gtid_binlog_pos'",
+    ).strip()
+
+    if not master_pos:
+        return
+
+    def replica_reached_pos():
+        # MASTER_GTID_WAIT() with no timeout returns 0 once the position is applied,
+        # the position is passed as a hex literal to avoid quoting it for the shell
+        output = PodmanCLIWrapper.podman_exec_shell_command(
+            cid_file_name=slave_cid,
+            cmd=f"mysql -uroot -N -B -e 'SELECT MASTER_GTID_WAIT(0x{master_pos.encode().hex()}, 0)'",
+        )
+        return output.strip() == "0"
+
+    wait_for(
+        replica_reached_pos,
+        timeout=timeout,
+        message=f"the replica to reach GTID {master_pos}",
+    )
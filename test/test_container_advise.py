@@ -0,0 +1,34 @@
+from container_ci_suite.engines.podman_wrapper import PodmanCLIWrapper
+
+from conftest import root_sql
+
+
+class TestMariaDBAdviseContainer:
+    """
+    Test the configuration advisor.
+    """
+
+    def test_advise_table_open_cache(self, mariadb_server):
+        """
+        Test that a table cache smaller than the number of tables is reported.
+        Steps are:
+        1. Shrink the table cache of the shared server below the number of tables
+        2. Check that MYSQL_TABLE_OPEN_CACHE is recommended with a reason
+        3. Restore the table cache
+        """
+        table_open_cache = PodmanCLIWrapper.podman_exec_shell_command(
+            cid_file_name=mariadb_server.cid,
+            cmd="mysql -uroot -N -B -e 'SELECT @@table_open_cache'",
+        ).strip()
+        root_sql(mariadb_server, "SET GLOBAL table_open_cache = 10;")
+        try:
+            output = PodmanCLIWrapper.podman_exec_shell_command(
+                cid_file_name=mariadb_server.cid,
+                cmd="mysqld-advise",
+            )
+        finally:
+            root_sql(
+                mariadb_server, f"SET GLOBAL table_open_cache = {table_open_cache};"
+            )
+        assert "MYSQL_TABLE_OPEN_CACHE=" in output, output
+        assert "of the table cache lookups miss the 10 cached tables" in output
@@ -1,22 +1,28 @@
+import re
 import shutil
 import tempfile
 
+import pytest
+
 from container_ci_suite.container_lib import ContainerTestLib
 from container_ci_suite.container_lib import ContainerTestLibUtils
+from container_ci_suite.container_lib import DatabaseWrapper
 from container_ci_suite.engines.podman_wrapper import PodmanCLIWrapper
 from pathlib import Path
 
 from conftest import VARS
 
 
-def build_s2i_app(app_path: Path) -> ContainerTestLib:
+def build_s2i_app(
+    app_path: Path, s2i_args: str = "", suffix: str = ""
+) -> ContainerTestLib:
     container_lib = ContainerTestLib(VARS.IMAGE_NAME)
     app_name = app_path.name
     s2i_app = container_lib.build_as_df(
         app_path=app_path,
-        s2i_args="--pull-policy=never",
+        s2i_args=f"--pull-policy=never {s2i_args}".strip(),
         src_image=VARS.IMAGE_NAME,
-        dst_image=f"{VARS.IMAGE_NAME}-{app_name}",
+        dst_image=f"{VARS.IMAGE_NAME}-{app_name}{suffix}-{VARS.WORKER}",
     )
     return s2i_app
 
@@ -115,3 +121,156 @@ class TestMariaDBBasicsContainer:
         )
         PodmanCLIWrapper.call_podman_command(cmd=f"stop {cid}")
         shutil.rmtree(data_dir)
+
+
+class TestMariaDBPrebuiltDatadirContainer:
+    """
+    Test MariaDB container with the data directory prebuilt during the s2i build.
+    """
+
+    def setup_method(self):
+        """
+        Setup the test environment.
+        """
+        self.app_image = build_s2i_app(
+            app_path=VARS.TEST_DIR / "test-app",
+            s2i_args="-e MYSQL_PREBUILD_DATADIR=true -e MYSQL_DATABASE=db",
+            suffix="-prebuilt",
+        )
+        self.app_image.set_new_db_type(db_type="mariadb")
+        self.db_api = DatabaseWrapper(image_name=VARS.IMAGE_NAME)
+
+    def teardown_method(self):
+        """
+        Teardown the test environment.
+        """
+        self.app_image.cleanup()
+
+    def test_prebuilt_datadir(self):
+        """
+        Test that the seed data come from the prebuilt data directory.
+        Steps are:
+        1. Create a container from the image with the prebuilt data directory
+        2. Check that the prebuilt data directory was used instead of loading the seed data
+        3. Check that the seed data and the user account are available
+        """
+        cid_prebuilt = "s2i_prebuilt"
+        assert self.app_image.create_container(
+            cid_file_name=cid_prebuilt,
+            container_args=[
+                "-e MYSQL_USER=config_test_user",
+                "-e MYSQL_PASSWORD=config_test_user",
+                "-e MYSQL_DATABASE=db",
+                "-e MYSQL_OPERATIONS_USER=operations_user",
+                "-e MYSQL_OPERATIONS_PASSWORD=operations_user",
+            ],
+        )
+        cip, cid = self.app_image.get_cip_cid(cid_file_name=cid_prebuilt)
+        assert cip, cid
+        assert self.app_image.test_db_connection(
+            container_ip=cip, username="config_test_user", password="config_test_user"
+        )
+        logs = PodmanCLIWrapper.podman_logs(container_id=cid)
+        assert "Copying prebuilt data directory" in logs
+        assert "Loading seed data" not in logs
+        output = self.db_api.run_sql_command(
+            container_ip=cip,
+            username="config_test_user",
+            password="config_test_user",
+            container_id=VARS.IMAGE_NAME,
+            database=f"db {VARS.SSL_OPTION}",
+            sql_cmd="SELECT name FROM products_variant;",
+        )
+        assert "green" in output
+        PodmanCLIWrapper.call_podman_command(cmd=f"stop {cid}")
+
+
+class TestMariaDBSeedDataContainer:
+    """
+    Test loading the seed data from the mysql-data directory.
+    """
+
+    def setup_method(self):
+        """
+        Setup the test environment.
+        """
+        self.db = ContainerTestLib(image_name=VARS.IMAGE_NAME)
+        self.db.set_new_db_type(db_type="mariadb")
+        self.app_dir = tempfile.mkdtemp(prefix="/tmp/mariadb-seed-data")
+
+    def teardown_method(self):
+        """
+        Teardown the test environment.
+        """
+        self.db.cleanup()
+        shutil.rmtree(self.app_dir)
+
+    @pytest.mark.parametrize(
+        "workers, seed_files",
+        [
+            # The data file depends on the schema file, so they are loaded in order
+            (
+                "1",
+                {
+                    "01 schema.sql": "CREATE TABLE items (id INT, name VARCHAR(20));\n"
+                    "CREATE TABLE colors (id INT, name VARCHAR(20));\n",
+                    "02-data.sql": "INSERT INTO items VALUES (1, 'first');\n",
+                    "colors.csv": "id,name\n1,red\n2,blue\n",
+                },
+            ),
+            (
+                "4",
+                {
+                    "items.sql": "CREATE TABLE items (id INT, name VARCHAR(20));\n"
+                    "INSERT INTO items VALUES (1, 'first');\n",
+                    "colors.sql": "CREATE TABLE colors (id INT, name VARCHAR(20));\n",
+                    "colors.csv": "id,name\n1,red\n2,blue\n",
+                },
+            ),
+        ],
+    )
+    def test_seed_data(self, workers, seed_files):
+        """
+        Test loading the *.sql and *.csv seed files one by one and in parallel.
+        Steps are:
+        1. Create a container with the seed files mounted in mysql-data
+        2. Check that the files were loaded by the requested number of workers
+        3. Check the rows of the *.sql and the *.csv files
+        """
+        data_dir = Path(self.app_dir, "mysql-data")
+        data_dir.mkdir()
+        for name, content in seed_files.items():
+            (data_dir / name).write_text(content)
+        assert ContainerTestLibUtils.commands_to_run(
+            commands_to_run=[
+                f"chown -R 27:27 {self.app_dir}",
+            ]
+        )
+        cid_seed_data = "seed_data"
+        assert self.db.create_container(
+            cid_file_name=cid_seed_data,
+            container_args=[
+                "-e MYSQL_USER=user",
+                "-e MYSQL_PASSWORD=foo",
+                "-e MYSQL_DATABASE=db",
+                f"-e MYSQL_SEED_DATA_WORKERS={workers}",
+                f"-v {self.app_dir}:/opt/app-root/src/:z",
+            ],
+        )
+        cip, cid = self.db.get_cip_cid(cid_file_name=cid_seed_data)
+        assert cip, cid
+        assert self.db.test_db_connection(
+            container_ip=cip, username="user", password="foo", max_attempts=10
+        )
+        logs = PodmanCLIWrapper.podman_logs(container_id=cid)
+        assert f"using {workers} workers" in logs
+        assert "Seed data loaded" in logs
+        output = PodmanCLIWrapper.podman_exec_shell_command(
+            cid_file_name=cid,
+            cmd="mysql -u root -N -e "
+            "'SELECT COUNT(*) FROM db.items; SELECT COUNT(*) FROM db.colors'",
+        )
+        assert re.search(r"^1\n2$", output.strip(), re.MULTILINE), (
+            f"Seed data not loaded: {output}"
+        )
+        PodmanCLIWrapper.call_podman_command(cmd=f"stop {cid}")
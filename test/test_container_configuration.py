@@ -121,6 +121,67 @@ class TestMariaDBConfigurationContainer:
             command="",
         )
 
+    @pytest.mark.parametrize(
+        "charset, collation",
+        [
+            ("latin2", "utf8mb4_unicode_ci"),
+            ("bad-charset", ""),
+        ],
+    )
+    def test_invalid_charset_configuration(self, charset, collation):
+        """
+        Test container creation fails with an invalid character set or collation.
+        """
+        cid_config_test = "invalid_charset_configuration"
+        collation_arg = f"-e MYSQL_COLLATION={collation}" if collation else ""
+        assert self.db.assert_container_creation_fails(
+            cid_file_name=cid_config_test,
+            container_args=[
+                "-e MYSQL_USER=user",
+                "-e MYSQL_PASSWORD=pass",
+                "-e MYSQL_DATABASE=db",
+                f"-e MYSQL_CHARSET={charset}",
+                collation_arg,
+            ],
+            command="",
+        )
+
+    def test_invalid_tmpdir_configuration(self):
+        """
+        Test container creation fails when MYSQL_TMPDIR is not a directory.
+        """
+        cid_config_test = "invalid_tmpdir_configuration"
+        assert self.db.assert_container_creation_fails(
+            cid_file_name=cid_config_test,
+            container_args=[
+                "-e MYSQL_USER=user",
+                "-e MYSQL_PASSWORD=pass",
+                "-e MYSQL_DATABASE=db",
+                "-e MYSQL_TMPDIR=/nonexistent",
+            ],
+            command="",
+        )
+
+    @pytest.mark.parametrize(
+        "variable",
+        ["MYSQL_MAX_CONNECTIONS", "MYSQL_TABLE_OPEN_CACHE"],
+    )
+    def test_invalid_table_cache_configuration(self, variable):
+        """
+        Test container creation fails when a table cache limit is not a number.
+        """
+        cid_config_test = "invalid_table_cache_configuration"
+        assert self.db.assert_container_creation_fails(
+            cid_file_name=cid_config_test,
+            container_args=[
+                "-e MYSQL_USER=user",
+                "-e MYSQL_PASSWORD=pass",
+                "-e MYSQL_DATABASE=db",
+                f"-e {variable}=many",
+            ],
+            command="",
+        )
+
 
 class TestMariaDBConfigurationTests:
     """
@@ -183,6 +244,8 @@ class TestMariaDBConfigurationTests:
             r"read_buffer_size\s*=\s*12M",
             r"innodb_log_file_size\s*=\s*38M",
             r"innodb_log_buffer_size\s*=\s*38M",
+            r"tmp_table_size\s*=\s*16M",
+            r"max_heap_table_size\s*=\s*16M",
         ]
         for value in expected_values:
             assert re.search(value, db_configuration), (
@@ -229,6 +292,8 @@ class TestMariaDBConfigurationTests:
                 "--env MYSQL_FT_MAX_WORD_LEN=15",
                 "--env MYSQL_MAX_ALLOWED_PACKET=10M",
                 "--env MYSQL_TABLE_OPEN_CACHE=100",
+                "--env MYSQL_TABLE_DEFINITION_CACHE=500",
+                "--env MYSQL_TABLE_OPEN_CACHE_INSTANCES=2",
                 "--env MYSQL_SORT_BUFFER_SIZE=256K",
                 "--env MYSQL_KEY_BUFFER_SIZE=16M",
                 "--env MYSQL_READ_BUFFER_SIZE=16M",
@@ -265,6 +330,10 @@ class TestMariaDBConfigurationTests:
             r"ft_max_word_len\s*=\s*15",
             r"max_allowed_packet\s*=\s*10M",
             r"table_open_cache\s*=\s*100",
+            r"table_definition_cache\s*=\s*500",
+            r"table_open_cache_instances\s*=\s*2",
+            # Two files for each cached table and one for each connection
+            r"open_files_limit\s*=\s*1547",
             r"sort_buffer_size\s*=\s*256K",
             r"key_buffer_size\s*=\s*16M",
             r"read_buffer_size\s*=\s*16M",
@@ -275,3 +344,354 @@ class TestMariaDBConfigurationTests:
             assert re.search(value, db_configuration), (
                 f"Word {value} not found in {db_configuration}"
             )
+
+    def test_configuration_slow_query_log(self):
+        """
+        Test the slow query log and the performance_schema preset.
+        """
+        cid_config_test = "slow_log_test"
+        username = "config_test_user"
+        password = "config_test"
+        assert self.db_config.create_container(
+            cid_file_name=cid_config_test,
+            container_args=[
+                f"--env MYSQL_USER={username}",
+                f"--env MYSQL_PASSWORD={password}",
+                "--env MYSQL_DATABASE=db",
+                "--env MYSQL_SLOW_QUERY_LOG=1",
+                "--env MYSQL_LONG_QUERY_TIME=0",
+                "--env MYSQL_LOG_SLOW_RATE_LIMIT=1",
+                "--env MYSQL_PERFORMANCE_SCHEMA=statements",
+            ],
+        )
+        cip, cid = self.db_config.get_cip_cid(cid_file_name=cid_config_test)
+        assert cip, cid
+        assert self.db_config.test_db_connection(
+            container_ip=cip,
+            username=username,
+            password=password,
+            max_attempts=10,
+            database=f"db {VARS.SSL_OPTION}",
+        )
+        self.db_api.run_sql_command(
+            container_ip=cip,
+            username=username,
+            password=password,
+            container_id=cid,
+            database=f"db {VARS.SSL_OPTION}",
+            sql_cmd="SELECT 'slow_log_marker';",
+            podman_run_command="exec",
+        )
+        slow_log = PodmanCLIWrapper.podman_exec_shell_command(
+            cid_file_name=cid,
+            cmd="cat /var/lib/mysql/data/mysql-slow.log",
+        )
+        assert "slow_log_marker" in slow_log
+        output = PodmanCLIWrapper.podman_exec_shell_command(
+            cid_file_name=cid,
+            cmd="mysql -u root -N -e 'SELECT COUNT(*) > 0 FROM "
+            "performance_schema.events_statements_summary_by_digest'",
+        )
+        assert output.strip() == "1"
+        PodmanCLIWrapper.call_podman_command(cmd=f"stop {cid}")
+
+    def test_configuration_tmpdir(self):
+        """
+        Test temporary files in a memory-backed MYSQL_TMPDIR and the temporary table sizes.
+        """
+        cid_config_test = "tmpdir_test"
+        username = "config_test_user"
+        password = "config_test"
+        assert self.db_config.create_container(
+            cid_file_name=cid_config_test,
+            container_args=[
+                f"--env MYSQL_USER={username}",
+                f"--env MYSQL_PASSWORD={password}",
+                "--env MYSQL_DATABASE=db",
+                "--env MYSQL_TMPDIR=/var/tmp/mysql",
+                "--env MYSQL_TMP_TABLE_SIZE=32M",
+            ],
+            docker_args="--tmpfs /var/tmp/mysql:rw,mode=1777",
+        )
+        cip, cid = self.db_config.get_cip_cid(cid_file_name=cid_config_test)
+        assert cip, cid
+        assert self.db_config.test_db_connection(
+            container_ip=cip,
+            username=username,
+            password=password,
+            max_attempts=10,
+            database=f"db {VARS.SSL_OPTION}",
+        )
+        output = PodmanCLIWrapper.podman_exec_shell_command(
+            cid_file_name=cid,
+            cmd="mysql -u root -N -e "
+            "'SELECT @@tmpdir, @@tmp_table_size, @@max_heap_table_size'",
+        )
+        assert re.search(r"/var/tmp/mysql\s+33554432\s+33554432", output), (
+            f"Temporary table settings not found in {output}"
+        )
+        logs = PodmanCLIWrapper.podman_logs(container_id=cid)
+        assert "Using memory-backed /var/tmp/mysql" in logs
+        PodmanCLIWrapper.call_podman_command(cmd=f"stop {cid}")
+
+    def test_configuration_thread_pool(self):
+        """
+        Test the thread pool and the per-user connection limit.
+        """
+        cid_config_test = "thread_pool_test"
+        username = "config_test_user"
+        password = "config_test"
+        assert self.db_config.create_container(
+            cid_file_name=cid_config_test,
+            container_args=[
+                f"--env MYSQL_USER={username}",
+                f"--env MYSQL_PASSWORD={password}",
+                "--env MYSQL_DATABASE=db",
+                "--env MYSQL_THREAD_HANDLING=pool-of-threads",
+                "--env MYSQL_THREAD_POOL_SIZE=2",
+                "--env MYSQL_MAX_USER_CONNECTIONS=50",
+            ],
+        )
+        cip, cid = self.db_config.get_cip_cid(cid_file_name=cid_config_test)
+        assert cip, cid
+        assert self.db_config.test_db_connection(
+            container_ip=cip,
+            username=username,
+            password=password,
+            max_attempts=10,
+            database=f"db {VARS.SSL_OPTION}",
+        )
+        output = PodmanCLIWrapper.podman_exec_shell_command(
+            cid_file_name=cid,
+            cmd="mysql -u root -N -e "
+            "'SELECT @@thread_handling, @@thread_pool_size, @@max_user_connections'",
+        )
+        assert re.search(r"pool-of-threads\s+2\s+50", output), (
+            f"Thread pool settings not found in {output}"
+        )
+        PodmanCLIWrapper.call_podman_command(cmd=f"stop {cid}")
+
+    def test_configuration_thread_pool_size_default(self):
+        """
+        Test that the thread pool size defaults to the number of CPUs of the container.
+        """
+        cid_config_test = "thread_pool_size_test"
+        username = "config_test_user"
+        password = "config_test"
+        assert self.db_config.create_container(
+            cid_file_name=cid_config_test,
+            container_args=[
+                f"--env MYSQL_USER={username}",
+                f"--env MYSQL_PASSWORD={password}",
+                "--env MYSQL_DATABASE=db",
+                "--env MYSQL_THREAD_HANDLING=pool-of-threads",
+            ],
+            docker_args="--cpuset-cpus=0-1",
+        )
+        cip, cid = self.db_config.get_cip_cid(cid_file_name=cid_config_test)
+        assert cip, cid
+        assert self.db_config.test_db_connection(
+            container_ip=cip,
+            username=username,
+            password=password,
+            max_attempts=10,
+            database=f"db {VARS.SSL_OPTION}",
+        )
+        output = PodmanCLIWrapper.podman_exec_shell_command(
+            cid_file_name=cid,
+            cmd="mysql -u root -N -e 'SELECT @@thread_pool_size'",
+        )
+        assert output.strip() == "2"
+        PodmanCLIWrapper.call_podman_command(cmd=f"stop {cid}")
+
+    @pytest.mark.parametrize(
+        "max_connections, expected_type",
+        [
+            ("100", "ON"),
+            ("500", "OFF"),
+        ],
+    )
+    def test_configuration_query_cache(self, max_connections, expected_type):
+        """
+        Test the query cache is enabled, unless the connections would contend for it.
+        """
+        cid_config_test = "query_cache_test"
+        username = "config_test_user"
+        password = "config_test"
+        assert self.db_config.create_container(
+            cid_file_name=cid_config_test,
+            container_args=[
+                f"--env MYSQL_USER={username}",
+                f"--env MYSQL_PASSWORD={password}",
+                "--env MYSQL_DATABASE=db",
+                "--env MYSQL_QUERY_CACHE_TYPE=ON",
+                f"--env MYSQL_MAX_CONNECTIONS={max_connections}",
+            ],
+            docker_args="--cpuset-cpus=0",
+        )
+        cip, cid = self.db_config.get_cip_cid(cid_file_name=cid_config_test)
+        assert cip, cid
+        assert self.db_config.test_db_connection(
+            container_ip=cip,
+            username=username,
+            password=password,
+            max_attempts=10,
+            database=f"db {VARS.SSL_OPTION}",
+        )
+        output = PodmanCLIWrapper.podman_exec_shell_command(
+            cid_file_name=cid,
+            cmd="mysql -u root -N -e 'SELECT @@query_cache_type'",
+        )
+        assert output.strip() == expected_type
+        if expected_type == "OFF":
+            logs = PodmanCLIWrapper.podman_logs(container_id=cid)
+            assert "Query cache left disabled" in logs
+        PodmanCLIWrapper.call_podman_command(cmd=f"stop {cid}")
+
+    def test_configuration_adaptive_log_file_size(self):
+        """
+        Test sizing innodb_log_file_size from the recorded redo log rate.
+        """
+        cid_config_test = "adaptive_log_test"
+        username = "config_test_user"
+        password = "config_test"
+        assert self.db_config.create_container(
+            cid_file_name=cid_config_test,
+            container_args=[
+                f"--env MYSQL_USER={username}",
+                f"--env MYSQL_PASSWORD={password}",
+                "--env MYSQL_DATABASE=db",
+                "--env MYSQL_INNODB_LOG_SIZING=adaptive",
+                "--env MYSQL_INNODB_LOG_TARGET_MINUTES=30",
+            ],
+        )
+        cip, cid = self.db_config.get_cip_cid(cid_file_name=cid_config_test)
+        assert cip, cid
+        assert self.db_config.test_db_connection(
+            container_ip=cip,
+            username=username,
+            password=password,
+            max_attempts=10,
+            database=f"db {VARS.SSL_OPTION}",
+        )
+        # 4M of redo log per minute
+        PodmanCLIWrapper.podman_exec_shell_command(
+            cid_file_name=cid,
+            cmd="echo 4194304 > /var/lib/mysql/data/mysql_redo_rate",
+        )
+        PodmanCLIWrapper.call_podman_command(cmd=f"restart {cid}")
+        assert self.db_config.test_db_connection(
+            container_ip=cip,
+            username=username,
+            password=password,
+            max_attempts=10,
+            database=f"db {VARS.SSL_OPTION}",
+        )
+        logs = PodmanCLIWrapper.podman_logs(container_id=cid)
+        assert "sizing innodb_log_file_size to 120M for 30 minutes" in logs
+        db_configuration = PodmanCLIWrapper.podman_exec_shell_command(
+            cid_file_name=cid,
+            cmd="cat /etc/my.cnf /etc/my.cnf.d/*",
+        )
+        assert re.search(r"innodb_log_file_size\s*=\s*120M", db_configuration)
+        PodmanCLIWrapper.call_podman_command(cmd=f"stop {cid}")
+
+    def test_configuration_table_cache_sizing(self):
+        """
+        Test sizing the table caches from the number of tables in the datadir.
+        """
+        cid_config_test = "table_cache_sizing_test"
+        username = "config_test_user"
+        password = "config_test"
+        assert self.db_config.create_container(
+            cid_file_name=cid_config_test,
+            container_args=[
+                f"--env MYSQL_USER={username}",
+                f"--env MYSQL_PASSWORD={password}",
+                "--env MYSQL_DATABASE=db",
+            ],
+        )
+        cip, cid = self.db_config.get_cip_cid(cid_file_name=cid_config_test)
+        assert cip, cid
+        assert self.db_config.test_db_connection(
+            container_ip=cip,
+            username=username,
+            password=password,
+            max_attempts=10,
+            database=f"db {VARS.SSL_OPTION}",
+        )
+        # More tables than the minimal cache of 400 holds
+        PodmanCLIWrapper.podman_exec_shell_command(
+            cid_file_name=cid,
+            cmd="seq 1 500 | sed 's/.*/CREATE TABLE t& (id INT);/' | mysql -uroot db",
+        )
+        PodmanCLIWrapper.call_podman_command(cmd=f"restart {cid}")
+        assert self.db_config.test_db_connection(
+            container_ip=cip,
+            username=username,
+            password=password,
+            max_attempts=10,
+            database=f"db {VARS.SSL_OPTION}",
+        )
+        logs = PodmanCLIWrapper.podman_logs(container_id=cid)
+        sizing = re.findall(r"Sizing table_open_cache to (\d+) for (\d+) tables", logs)
+        assert sizing, logs
+        open_cache, tables = (int(value) for value in sizing[-1])
+        # The system tables are counted too
+        assert tables >= 500
+        assert open_cache == tables * 12 // 10
+        definition_cache = tables * 11 // 10
+        db_configuration = PodmanCLIWrapper.podman_exec_shell_command(
+            cid_file_name=cid,
+            cmd="cat /etc/my.cnf /etc/my.cnf.d/*",
+        )
+        assert re.search(rf"table_open_cache\s*=\s*{open_cache}\b", db_configuration)
+        assert re.search(
+            rf"table_definition_cache\s*=\s*{definition_cache}\b", db_configuration
+        )
+        # Two files for every cached table, one for every connection and 10 spare
+        assert re.search(
+            rf"open_files_limit\s*=\s*{open_cache * 2 + 151 + 10}\b", db_configuration
+        )
+        output = PodmanCLIWrapper.podman_exec_shell_command(
+            cid_file_name=cid,
+            cmd="mysql -u root -N -e 'SELECT @@table_open_cache, @@table_definition_cache'",
+        )
+        assert output.split() == [str(open_cache), str(definition_cache)]
+        PodmanCLIWrapper.call_podman_command(cmd=f"stop {cid}")
+
+    def test_configuration_server_collation(self):
+        """
+        Test the server character set is derived from MYSQL_COLLATION.
+        """
+        cid_config_test = "server_collation_test"
+        username = "config_test_user"
+        password = "config_test"
+        assert self.db_config.create_container(
+            cid_file_name=cid_config_test,
+            container_args=[
+                f"--env MYSQL_USER={username}",
+                f"--env MYSQL_PASSWORD={password}",
+                "--env MYSQL_DATABASE=db",
+                "--env MYSQL_COLLATION=utf8mb4_unicode_ci",
+            ],
+        )
+        cip, cid = self.db_config.get_cip_cid(cid_file_name=cid_config_test)
+        assert cip, cid
+        assert self.db_config.test_db_connection(
+            container_ip=cip,
+            username=username,
+            password=password,
+            max_attempts=10,
+            database=f"db {VARS.SSL_OPTION}",
+        )
+        output = PodmanCLIWrapper.podman_exec_shell_command(
+            cid_file_name=cid,
+            cmd="mysql -u root -N -e 'SELECT @@character_set_server, @@collation_server, "
+            "DEFAULT_COLLATION_NAME FROM information_schema.SCHEMATA "
+            'WHERE SCHEMA_NAME = "db"\'',
+        )
+        assert re.search(
+            r"utf8mb4\s+utf8mb4_unicode_ci\s+utf8mb4_unicode_ci", output
+        ), f"Server collation not found in {output}"
+        PodmanCLIWrapper.call_podman_command(cmd=f"stop {cid}")
@@ -8,6 +8,8 @@ from container_ci_suite.engines.podman_wrapper import PodmanCLIWrapper
 from container_ci_suite.container_lib import DatabaseWrapper
 
 from conftest import VARS
+from conftest import SHARED_PASSWORD
+from conftest import SHARED_USER
 
 
 class TestMariaDBGeneralContainer:
@@ -137,7 +139,15 @@ class TestMariaDBGeneralContainer:
         assert self.db_image.db_lib.assert_local_access(container_id=cid)
         self.database_test(cip, username, password)
 
-    def database_test(self, cip, username, password):
+    def test_database(self, mariadb_server, mariadb_database):
+        """
+        Test the table operations in a database of the shared server.
+        """
+        self.database_test(
+            mariadb_server.cip, SHARED_USER, SHARED_PASSWORD, database=mariadb_database
+        )
+
+    def database_test(self, cip, username, password, database="db"):
         """
         Test MariaDB database creation.
         """
@@ -146,7 +156,7 @@ class TestMariaDBGeneralContainer:
             username=username,
             password=password,
             container_id=VARS.IMAGE_NAME,
-            database=f"db {VARS.SSL_OPTION}",
+            database=f"{database} {VARS.SSL_OPTION}",
             sql_cmd=[
                 "CREATE TABLE tbl (a integer, b integer);",
             ],
@@ -156,7 +166,7 @@ class TestMariaDBGeneralContainer:
             username=username,
             password=password,
             container_id=VARS.IMAGE_NAME,
-            database=f"db {VARS.SSL_OPTION}",
+            database=f"{database} {VARS.SSL_OPTION}",
             sql_cmd=[
                 "INSERT INTO tbl VALUES (1, 2);",
                 "INSERT INTO tbl VALUES (3, 4);",
@@ -168,7 +178,7 @@ class TestMariaDBGeneralContainer:
             username=username,
             password=password,
             container_id=VARS.IMAGE_NAME,
-            database=f"db {VARS.SSL_OPTION}",
+            database=f"{database} {VARS.SSL_OPTION}",
             sql_cmd="SELECT * FROM tbl;",
         )
         expected_db_output = [
@@ -183,6 +193,6 @@ class TestMariaDBGeneralContainer:
             username=username,
             password=password,
             container_id=VARS.IMAGE_NAME,
-            database=f"db {VARS.SSL_OPTION}",
+            database=f"{database} {VARS.SSL_OPTION}",
             sql_cmd="DROP TABLE tbl;",
         )
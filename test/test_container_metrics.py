@@ -0,0 +1,40 @@
+import re
+
+from container_ci_suite.engines.podman_wrapper import PodmanCLIWrapper
+
+
+class TestMariaDBMetricsContainer:
+    """
+    Test the built-in metrics endpoint.
+    """
+
+    def test_metrics_endpoint(self, mariadb_server):
+        """
+        Test that the metrics are served when MYSQL_METRICS_PORT is set.
+        Steps are:
+        1. Scrape the metrics from inside the shared server, which sets MYSQL_METRICS_PORT
+        2. Check the server and startup stage metrics are present
+        3. Check that an unknown path is refused
+        """
+        output = PodmanCLIWrapper.podman_exec_shell_command(
+            cid_file_name=mariadb_server.cid,
+            cmd="printf 'GET /metrics HTTP/1.0\\r\\n\\r\\n' | ncat 127.0.0.1 9104",
+        )
+        expected_values = [
+            r"^HTTP/1.0 200 OK",
+            r"^mariadb_up 1$",
+            r"^mariadb_innodb_buffer_pool_hit_ratio [0-9.e-]+$",
+            r"^mariadb_threads_connected [0-9]+$",
+            r"^mariadb_max_connections 151$",
+            r'^mariadb_container_startup_stage_seconds\{stage="init"\} [0-9.]+$',
+        ]
+        for value in expected_values:
+            assert re.search(value, output, re.MULTILINE), (
+                f"Metric {value} not found in {output}"
+            )
+        assert "mariadb_slave_lag_seconds" not in output
+        output = PodmanCLIWrapper.podman_exec_shell_command(
+            cid_file_name=mariadb_server.cid,
+            cmd="printf 'GET / HTTP/1.0\\r\\n\\r\\n' | ncat 127.0.0.1 9104",
+        )
+        assert "404 Not Found" in output
@@ -65,6 +65,75 @@ class TestMariaDBPasswordContainer:
             user_change=user_change,
         )
 
+    def test_password_unchanged(self):
+        """
+        Test that no account statements are run when the passwords did not change.
+        """
+        cid_file_name = "test_password_unchanged"
+        assert self.pwd_change.create_container(
+            cid_file_name=cid_file_name,
+            container_args=[
+                "-e MYSQL_USER=user",
+                "-e MYSQL_PASSWORD=foo",
+                "-e MYSQL_DATABASE=db",
+                "-e MYSQL_ROOT_PASSWORD=rootpass",
+            ],
+        )
+        cip, cid = self.pwd_change.get_cip_cid(cid_file_name=cid_file_name)
+        assert cip, cid
+        assert self.pwd_change.test_db_connection(
+            container_ip=cip,
+            username="root",
+            password="rootpass",
+            database=f"db {VARS.SSL_OPTION}",
+        )
+        mariadb_logs = PodmanCLIWrapper.podman_logs(
+            container_id=cid,
+        )
+        assert "Passwords are up to date" in mariadb_logs
+        assert "Changing password for user" not in mariadb_logs
+
+    def test_root_privileges_restored(self):
+        """
+        Test that a remote root account that lost a privilege is granted it again.
+        Steps are:
+        1. Create a container with MYSQL_ROOT_PASSWORD
+        2. Revoke a privilege from the remote root account and restart the container
+        3. Check that the remote root account holds all privileges again
+        """
+        cid_file_name = "test_root_privileges"
+        assert self.pwd_change.create_container(
+            cid_file_name=cid_file_name,
+            container_args=[
+                "-e MYSQL_ROOT_PASSWORD=rootpass",
+            ],
+        )
+        cip, cid = self.pwd_change.get_cip_cid(cid_file_name=cid_file_name)
+        assert cip, cid
+        assert self.pwd_change.test_db_connection(
+            container_ip=cip, username="root", password="rootpass"
+        )
+        PodmanCLIWrapper.podman_exec_shell_command(
+            cid_file_name=cid,
+            cmd="mysql -u root -e 'REVOKE DELETE ON *.* FROM root'",
+        )
+        PodmanCLIWrapper.call_podman_command(cmd=f"restart {cid}")
+        assert self.pwd_change.test_db_connection(
+            container_ip=cip, username="root", password="rootpass"
+        )
+        mariadb_logs = PodmanCLIWrapper.podman_logs(container_id=cid)
+        # Once on the first start and again after the privilege was revoked
+        assert (
+            mariadb_logs.count("Setting password for remote access of MySQL root user")
+            == 2
+        )
+        grants = PodmanCLIWrapper.podman_exec_shell_command(
+            cid_file_name=cid,
+            cmd="mysql -u root -N -B -e 'SHOW GRANTS FOR root'",
+        )
+        assert "GRANT ALL PRIVILEGES ON *.* TO" in grants
+        assert "WITH GRANT OPTION" in grants
+
     def password_change_test(
         self,
         username,
@@ -0,0 +1,30 @@
+from container_ci_suite.engines.podman_wrapper import PodmanCLIWrapper
+
+
+class TestMariaDBProbeContainer:
+    """
+    Test the readiness and liveness probe.
+    """
+
+    def probe(self, cid, probe_type, env=""):
+        """
+        Run the probe in the container and return whether it passed.
+        """
+        output = PodmanCLIWrapper.podman_exec_shell_command(
+            cid_file_name=cid,
+            cmd=f"{env} mysqld-probe {probe_type} && echo passed || echo failed",
+        )
+        return "passed" in output
+
+    def test_probe(self, mariadb_server):
+        """
+        Test the probe results.
+        Steps are:
+        1. Check that the liveness and readiness probes pass on the shared server
+        2. Check that the readiness probe fails over the threads running ceiling
+        """
+        assert self.probe(mariadb_server.cid, "liveness")
+        assert self.probe(mariadb_server.cid, "readiness")
+        assert not self.probe(
+            mariadb_server.cid, "readiness", env="MYSQL_PROBE_MAX_THREADS_RUNNING=0"
+        )
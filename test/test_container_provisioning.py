@@ -0,0 +1,125 @@
+import tempfile
+
+from container_ci_suite.container_lib import ContainerTestLib
+from container_ci_suite.container_lib import ContainerTestLibUtils
+from container_ci_suite.engines.podman_wrapper import PodmanCLIWrapper
+from pathlib import Path
+
+from conftest import VARS
+
+
+class TestMariaDBProvisioningContainer:
+    """
+    Test provisioning databases and users from a file.
+    """
+
+    def setup_method(self):
+        """
+        Setup the test environment.
+        """
+        self.db = ContainerTestLib(image_name=VARS.IMAGE_NAME)
+        self.db.set_new_db_type(db_type="mariadb")
+        self.provisioning_dir = tempfile.mkdtemp(prefix="/tmp/mariadb-provisioning")
+        Path(self.provisioning_dir, "provisioning.conf").write_text(
+            "# Test provisioning\n"
+            "database shop\n"
+            "database reports\n"
+            "user shop_app shop_pass shop,reports\n"
+            # The last line has no trailing newline and must be applied too
+            "user reporter reporter_pass reports SELECT"
+        )
+        assert ContainerTestLibUtils.commands_to_run(
+            commands_to_run=[
+                f"chmod -R a+rx {self.provisioning_dir}",
+            ]
+        )
+
+    def teardown_method(self):
+        """
+        Teardown the test environment.
+        """
+        self.db.cleanup()
+
+    def test_provisioning_file(self):
+        """
+        Test the databases and users from the provisioning file are created.
+        Steps are:
+        1. Create a container with MYSQL_PROVISIONING_FILE
+        2. Check the provisioned users can connect to their databases
+        3. Restart the container and check the provisioning is applied again
+        """
+        cid_file_name = "provisioning"
+        assert self.db.create_container(
+            cid_file_name=cid_file_name,
+            container_args=[
+                "-e MYSQL_ROOT_PASSWORD=root_pass",
+                "-e MYSQL_PROVISIONING_FILE=/provisioning/provisioning.conf",
+                f"-v {self.provisioning_dir}:/provisioning:Z",
+            ],
+        )
+        cip, cid = self.db.get_cip_cid(cid_file_name=cid_file_name)
+        assert cip, cid
+        for username, password, database in [
+            ("shop_app", "shop_pass", "shop"),
+            ("shop_app", "shop_pass", "reports"),
+            ("reporter", "reporter_pass", "reports"),
+        ]:
+            assert self.db.test_db_connection(
+                container_ip=cip,
+                username=username,
+                password=password,
+                database=f"{database} {VARS.SSL_OPTION}",
+            )
+        PodmanCLIWrapper.call_podman_command(cmd=f"restart {cid}")
+        assert self.db.test_db_connection(
+            container_ip=cip,
+            username="reporter",
+            password="reporter_pass",
+            database=f"reports {VARS.SSL_OPTION}",
+        )
+        logs = PodmanCLIWrapper.podman_logs(container_id=cid)
+        assert logs.count("Provisioned 2 databases and 2 users") == 2
+        PodmanCLIWrapper.call_podman_command(cmd=f"stop {cid}")
+
+    def test_provisioning_revokes_removed_grants(self):
+        """
+        Test that the privileges removed from the provisioning file are revoked.
+        Steps are:
+        1. Create a container with MYSQL_PROVISIONING_FILE
+        2. Remove a database from the grants of a user in the file and restart
+        3. Check the user keeps only the grants listed in the file
+        """
+        cid_file_name = "provisioning_revoke"
+        assert self.db.create_container(
+            cid_file_name=cid_file_name,
+            container_args=[
+                "-e MYSQL_ROOT_PASSWORD=root_pass",
+                "-e MYSQL_PROVISIONING_FILE=/provisioning/provisioning.conf",
+                f"-v {self.provisioning_dir}:/provisioning:Z",
+            ],
+        )
+        cip, cid = self.db.get_cip_cid(cid_file_name=cid_file_name)
+        assert cip, cid
+        assert self.db.test_db_connection(
+            container_ip=cip,
+            username="shop_app",
+            password="shop_pass",
+            database=f"reports {VARS.SSL_OPTION}",
+        )
+        Path(self.provisioning_dir, "provisioning.conf").write_text(
+            "database shop\ndatabase reports\nuser shop_app shop_pass shop\n"
+        )
+        PodmanCLIWrapper.call_podman_command(cmd=f"restart {cid}")
+        assert self.db.test_db_connection(
+            container_ip=cip,
+            username="shop_app",
+            password="shop_pass",
+            database=f"shop {VARS.SSL_OPTION}",
+        )
+        grants = PodmanCLIWrapper.podman_exec_shell_command(
+            cid_file_name=cid,
+            cmd="mysql -u root -N -B -e 'SHOW GRANTS FOR shop_app'",
+        )
+        assert "`shop`" in grants
+        assert "`reports`" not in grants
+        PodmanCLIWrapper.call_podman_command(cmd=f"stop {cid}")
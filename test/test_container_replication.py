@@ -1,11 +1,14 @@
 import re
-from time import sleep
 
 from container_ci_suite.container_lib import ContainerTestLib
 from container_ci_suite.engines.database import DatabaseWrapper
 from container_ci_suite.engines.podman_wrapper import PodmanCLIWrapper
 
 from conftest import VARS
+from conftest import REPLICATION_ARGS
+from conftest import create_test_database
+from conftest import root_sql
+from polling import wait_for_replica
 
 
 class TestMariaDBReplicationContainer:
@@ -30,78 +33,11 @@ class TestMariaDBReplicationContainer:
         """
         self.replication_db.cleanup()
 
-    def test_replication(self):
-        """
-        Test replication.
-        """
-        cluster_args = "-e MYSQL_MASTER_USER=master -e MYSQL_MASTER_PASSWORD=master -e MYSQL_DATABASE=db"
-        master_cid_name = "master.cid"
-        username = "user"
-        password = "foo"
-        container_args = [
-            f"-e MYSQL_USER={username}",
-            f"-e MYSQL_PASSWORD={password}",
-            "-e MYSQL_ROOT_PASSWORD=root",
-        ]
-        # Run the MySQL source
-        assert self.replication_db.create_container(
-            cid_file_name=master_cid_name,
-            container_args=container_args,
-            docker_args=cluster_args,
-            command="mysqld-master",
-        )
-        master_cip, master_cid = self.replication_db.get_cip_cid(
-            cid_file_name=master_cid_name
-        )
-        assert master_cip, master_cid
-        # Run the MySQL replica
-        slave_cid_name = "slave.cid"
-        assert self.replication_db.create_container(
-            cid_file_name=slave_cid_name,
-            container_args=[
-                f"-e MYSQL_MASTER_SERVICE_NAME={master_cip}",
-            ],
-            docker_args=cluster_args,
-            command="mysqld-slave",
-        )
-        slave_cip, slave_cid = self.replication_db.get_cip_cid(
-            cid_file_name=slave_cid_name
-        )
-        assert slave_cip, slave_cid
-        # Now wait till the SOURCE will see the REPLICA
-        assert self.replication_db.test_db_connection(
-            container_ip=master_cip,
-            username="root",
-            password="root",
-        )
-        for _ in range(10):
-            result = self.db_wrapper_api.run_sql_command(
-                container_ip=master_cip,
-                username="root",
-                password="root",
-                container_id=master_cid,
-                database=f"db {VARS.SSL_OPTION}",
-                sql_cmd="SHOW SLAVE HOSTS;",
-                podman_run_command="exec",
-            )
-            if isinstance(result, bool):
-                sleep(3)
-                continue
-            if slave_cip in result:
-                break
-            sleep(3)
-        else:
-            assert False, "Slave IP not found!"
-        assert self.replication_db.test_db_connection(
-            container_ip=slave_cip,
-            username="root",
-            password="root",
-        )
-        sql_cmd = "show slave status\\G;"
-        mysql_cmd = f'mysql -uroot <<< "{sql_cmd}"'
-        slave_status = PodmanCLIWrapper.call_podman_command(
-            cmd=f"exec {slave_cid} bash -c '{mysql_cmd}'",
-        )
+    def test_replica_status(self, mariadb_replication):
+        """
+        Test that the replication threads of the replica are running.
+        """
+        slave_status = root_sql(mariadb_replication.slave, "SHOW SLAVE STATUS\\G")
         slave_statuses = [
             r"Slave_IO_Running:\s*Yes",
             r"Slave_SQL_Running:\s*Yes",
@@ -111,34 +47,128 @@ class TestMariaDBReplicationContainer:
                 f"Status {status} not found in {slave_status}"
             )
 
+    def test_replica_settings(self, mariadb_replication):
+        """
+        Test that the replica is read-only and keeps the server-id of its ordinal.
+        """
+        read_only = PodmanCLIWrapper.podman_exec_shell_command(
+            cid_file_name=mariadb_replication.slave.cid,
+            cmd="mysql -uroot -N -e 'SELECT @@read_only'",
+        )
+        assert read_only.strip() == "1", f"Replica is not read-only: {read_only}"
+        server_id = PodmanCLIWrapper.podman_exec_shell_command(
+            cid_file_name=mariadb_replication.slave.cid,
+            cmd="mysql -uroot -N -e 'SELECT @@server_id'; cat /var/lib/mysql/data/mysql_server_id",
+        )
+        assert server_id.split() == ["5", "5"], f"Unexpected server-id: {server_id}"
+
+    def test_replica_probe(self, mariadb_replication):
+        """
+        Test that the replica passes the readiness probe with a lag threshold.
+        """
+        probe = PodmanCLIWrapper.podman_exec_shell_command(
+            cid_file_name=mariadb_replication.slave.cid,
+            cmd="MYSQL_PROBE_MAX_REPLICA_LAG=10 mysqld-probe readiness && echo probe-ok",
+        )
+        assert "probe-ok" in probe, f"Replica is not ready: {probe}"
+
+    def test_replication(self, mariadb_replication):
+        """
+        Test that the data written on the master is replicated.
+        """
+        master, slave = mariadb_replication
+        database = create_test_database(master)
         self.db_wrapper_api.run_sql_command(
-            container_ip=master_cip,
+            container_ip=master.cip,
             username="root",
             password="root",
-            database=f"db {VARS.SSL_OPTION}",
+            database=f"{database} {VARS.SSL_OPTION}",
             container_id=VARS.IMAGE_NAME,
             sql_cmd="CREATE TABLE t1 (a INT);",
             max_attempts=3,
         )
         self.db_wrapper_api.run_sql_command(
-            container_ip=master_cip,
+            container_ip=master.cip,
             username="root",
             password="root",
-            database=f"db {VARS.SSL_OPTION}",
+            database=f"{database} {VARS.SSL_OPTION}",
             container_id=VARS.IMAGE_NAME,
             sql_cmd="INSERT INTO t1 VALUES (24);",
             max_attempts=3,
         )
-        # let's wait for the table to be created and available for replication
-        sleep(3)
+        wait_for_replica(master.cid, slave.cid)
         table_output = self.db_wrapper_api.run_sql_command(
-            container_ip=slave_cip,
+            container_ip=slave.cip,
             username="root",
             password="root",
-            database=f"db {VARS.SSL_OPTION}",
+            database=f"{database} {VARS.SSL_OPTION}",
             container_id=VARS.IMAGE_NAME,
             sql_cmd="select * from t1;",
         )
         assert re.search(r"^a\n^24", table_output, re.MULTILINE), (
-            f"Replica {slave_cip} did not get value from MASTER {master_cip}"
+            f"Replica {slave.cip} did not get value from MASTER {master.cip}"
+        )
+        root_sql(master, f"DROP DATABASE {database};")
+
+    def binlog_bytes(self, cid):
+        """
+        Return the total size of the binlog files of a master.
+        """
+        output = PodmanCLIWrapper.podman_exec_shell_command(
+            cid_file_name=cid,
+            cmd="mysql -uroot -N -B -e 'SHOW BINARY LOGS'",
+        )
+        return sum(int(line.split()[1]) for line in output.splitlines())
+
+    def binlog_bytes_for_bulk_update(self, cid_file_name, binlog_args):
+        """
+        Return the number of binlog bytes written by a bulk update on a master.
+        """
+        assert self.replication_db.create_container(
+            cid_file_name=cid_file_name,
+            container_args=[
+                "-e MYSQL_USER=user",
+                "-e MYSQL_PASSWORD=foo",
+                "-e MYSQL_BINLOG_FORMAT=row",
+            ]
+            + binlog_args,
+            docker_args=REPLICATION_ARGS,
+            command="mysqld-master",
+        )
+        cip, cid = self.replication_db.get_cip_cid(cid_file_name=cid_file_name)
+        assert cip, cid
+        assert self.replication_db.test_db_connection(
+            container_ip=cip, username="user", password="foo"
+        )
+        PodmanCLIWrapper.podman_exec_shell_command(
+            cid_file_name=cid,
+            cmd="mysql -uroot db -e 'CREATE TABLE wide (id INT PRIMARY KEY, "
+            "a CHAR(200), b CHAR(200), counter INT); "
+            "INSERT INTO wide SELECT seq, REPEAT(1, 200), REPEAT(2, 200), 0 FROM seq_1_to_2000'",
+        )
+        before = self.binlog_bytes(cid)
+        PodmanCLIWrapper.podman_exec_shell_command(
+            cid_file_name=cid,
+            cmd="mysql -uroot db -e 'UPDATE wide SET counter = counter + 1'",
+        )
+        return self.binlog_bytes(cid) - before
+
+    def test_binlog_size_tuning(self):
+        """
+        Test that the minimal row image and the compression reduce the binlog
+        the replicas have to transfer for a bulk update.
+        """
+        full_bytes = self.binlog_bytes_for_bulk_update(
+            cid_file_name="binlog_full", binlog_args=[]
+        )
+        minimal_bytes = self.binlog_bytes_for_bulk_update(
+            cid_file_name="binlog_minimal",
+            binlog_args=[
+                "-e MYSQL_BINLOG_ROW_IMAGE=MINIMAL",
+                "-e MYSQL_BINLOG_COMPRESS=ON",
+                "-e MYSQL_BINLOG_EXPIRE_LOGS_SECONDS=86400",
+            ],
+        )
+        assert 0 < minimal_bytes < full_bytes / 4, (
+            f"The bulk update wrote {minimal_bytes} binlog bytes, {full_bytes} with the full row image"
         )
@@ -0,0 +1,131 @@
+import gzip
+import re
+import tempfile
+
+from pathlib import Path
+
+from container_ci_suite.container_lib import ContainerTestLib
+from container_ci_suite.container_lib import ContainerTestLibUtils
+from container_ci_suite.container_lib import DatabaseWrapper
+from container_ci_suite.engines.podman_wrapper import PodmanCLIWrapper
+
+from conftest import VARS
+
+
+class TestMariaDBRestoreContainer:
+    """
+    Test seeding the data directory from a physical back-up.
+    """
+
+    def setup_method(self):
+        """
+        Setup the test environment.
+        """
+        self.db = ContainerTestLib(image_name=VARS.IMAGE_NAME)
+        self.db.set_new_db_type(db_type="mariadb")
+        self.db_api = DatabaseWrapper(image_name=VARS.IMAGE_NAME)
+        self.backup_dir = tempfile.mkdtemp(prefix="/tmp/mariadb-backup")
+        assert ContainerTestLibUtils.commands_to_run(
+            commands_to_run=[
+                f"chmod -R a+rwx {self.backup_dir}",
+            ]
+        )
+
+    def teardown_method(self):
+        """
+        Teardown the test environment.
+        """
+        self.db.cleanup()
+
+    def test_restore_from_backup(self):
+        """
+        Test restoring a back-up of one container into a new one.
+        Steps are:
+        1. Create a container and store a row in the database
+        2. Stream a compressed back-up of the container into a mounted directory
+        3. Create a new container with MYSQL_RESTORE_FROM pointing to the back-up
+        4. Check that the row is available in the new container
+        """
+        username = "user"
+        password = "foo"
+        container_args = [
+            f"-e MYSQL_USER={username}",
+            f"-e MYSQL_PASSWORD={password}",
+            "-e MYSQL_DATABASE=db",
+            f"-v {self.backup_dir}:/backup:Z",
+        ]
+        source_cid_file = "restore_source"
+        assert self.db.create_container(
+            cid_file_name=source_cid_file,
+            container_args=container_args,
+        )
+        cip, cid = self.db.get_cip_cid(cid_file_name=source_cid_file)
+        assert cip, cid
+        assert self.db.test_db_connection(
+            container_ip=cip, username=username, password=password
+        )
+        self.db_api.run_sql_command(
+            container_ip=cip,
+            username=username,
+            password=password,
+            container_id=VARS.IMAGE_NAME,
+            database=f"db {VARS.SSL_OPTION}",
+            sql_cmd=[
+                "CREATE TABLE tbl (a INT);",
+                "INSERT INTO tbl VALUES (42);",
+            ],
+        )
+        backup_cmd = (
+            "$(command -v mariadb-backup || command -v mariabackup)"
+            " --backup --user=root --stream=xbstream 2>/dev/null"
+            " | gzip > /backup/backup.xb.gz"
+        )
+        PodmanCLIWrapper.podman_exec_shell_command(
+            cid_file_name=cid,
+            cmd=backup_cmd,
+        )
+        PodmanCLIWrapper.call_podman_command(cmd=f"stop {cid}")
+
+        restored_cid_file = "restore_target"
+        assert self.db.create_container(
+            cid_file_name=restored_cid_file,
+            container_args=container_args
+            + ["-e MYSQL_RESTORE_FROM=/backup/backup.xb.gz"],
+        )
+        cip, cid = self.db.get_cip_cid(cid_file_name=restored_cid_file)
+        assert cip, cid
+        assert self.db.test_db_connection(
+            container_ip=cip, username=username, password=password
+        )
+        logs = PodmanCLIWrapper.podman_logs(container_id=cid)
+        assert "Data directory restored" in logs
+        output = self.db_api.run_sql_command(
+            container_ip=cip,
+            username=username,
+            password=password,
+            container_id=VARS.IMAGE_NAME,
+            database=f"db {VARS.SSL_OPTION}",
+            sql_cmd="SELECT * FROM tbl;",
+        )
+        assert re.search(r"^a\n^42", output, re.MULTILINE), (
+            f"Restored row not found in {output}"
+        )
+        PodmanCLIWrapper.call_podman_command(cmd=f"stop {cid}")
+
+    def test_restore_from_truncated_backup(self):
+        """
+        Test that the container fails to start from a truncated compressed back-up.
+        """
+        backup = gzip.compress(b"not a complete mbstream stream" * 1000)
+        Path(self.backup_dir, "truncated.xb.gz").write_bytes(backup[: len(backup) // 2])
+        assert self.db.assert_container_creation_fails(
+            cid_file_name="restore_truncated",
+            container_args=[
+                "-e MYSQL_USER=user",
+                "-e MYSQL_PASSWORD=foo",
+                "-e MYSQL_DATABASE=db",
+                f"-v {self.backup_dir}:/backup:Z",
+                "-e MYSQL_RESTORE_FROM=/backup/truncated.xb.gz",
+            ],
+            command="",
+        )
@@ -0,0 +1,101 @@
+from container_ci_suite.container_lib import ContainerTestLib
+from container_ci_suite.engines.podman_wrapper import PodmanCLIWrapper
+
+from conftest import VARS
+
+
+class TestMariaDBShutdownContainer:
+    """
+    Test the managed shutdown.
+    """
+
+    def setup_method(self):
+        """
+        Setup the test environment.
+        """
+        self.db = ContainerTestLib(image_name=VARS.IMAGE_NAME)
+        self.db.set_new_db_type(db_type="mariadb")
+
+    def teardown_method(self):
+        """
+        Teardown the test environment.
+        """
+        self.db.cleanup()
+
+    def test_managed_shutdown(self):
+        """
+        Test that the dirty pages are flushed before the server is stopped.
+        Steps are:
+        1. Create a container with MYSQL_SHUTDOWN_TIMEOUT
+        2. Stop the container
+        3. Check the shutdown was logged and the server exited cleanly
+        """
+        username = "user"
+        password = "foo"
+        cid_file_name = "shutdown"
+        assert self.db.create_container(
+            cid_file_name=cid_file_name,
+            container_args=[
+                f"-e MYSQL_USER={username}",
+                f"-e MYSQL_PASSWORD={password}",
+                "-e MYSQL_DATABASE=db",
+                "-e MYSQL_SHUTDOWN_TIMEOUT=5",
+            ],
+        )
+        cip, cid = self.db.get_cip_cid(cid_file_name=cid_file_name)
+        assert cip, cid
+        assert self.db.test_db_connection(
+            container_ip=cip, username=username, password=password
+        )
+        PodmanCLIWrapper.call_podman_command(cmd=f"stop -t 30 {cid}")
+        logs = PodmanCLIWrapper.podman_logs(container_id=cid)
+        assert "Flushing InnoDB dirty pages before the shutdown" in logs
+        assert "MySQL shut down in" in logs
+        exit_code = PodmanCLIWrapper.call_podman_command(
+            cmd=f"inspect -f '{{{{.State.ExitCode}}}}' {cid}",
+        )
+        assert exit_code.strip() == "0"
+
+    def test_liveness_with_managed_shutdown(self):
+        """
+        Test the liveness probe when the server runs as a child of the entrypoint.
+        Steps are:
+        1. Create a container with MYSQL_SHUTDOWN_TIMEOUT
+        2. Check that the liveness probe passes
+        3. Make the server unreachable by moving its socket away
+        4. Check that the liveness probe fails
+        """
+        username = "user"
+        password = "foo"
+        cid_file_name = "shutdown_liveness"
+        assert self.db.create_container(
+            cid_file_name=cid_file_name,
+            container_args=[
+                f"-e MYSQL_USER={username}",
+                f"-e MYSQL_PASSWORD={password}",
+                "-e MYSQL_DATABASE=db",
+                "-e MYSQL_SHUTDOWN_TIMEOUT=5",
+            ],
+        )
+        cip, cid = self.db.get_cip_cid(cid_file_name=cid_file_name)
+        assert cip, cid
+        assert self.db.test_db_connection(
+            container_ip=cip, username=username, password=password
+        )
+        liveness_cmd = "mysqld-probe liveness && echo passed || echo failed"
+        output = PodmanCLIWrapper.podman_exec_shell_command(
+            cid_file_name=cid, cmd=liveness_cmd
+        )
+        assert "passed" in output
+        socket = PodmanCLIWrapper.podman_exec_shell_command(
+            cid_file_name=cid,
+            cmd="mysql -u root -N -B -e 'SELECT @@socket'",
+        ).strip()
+        PodmanCLIWrapper.podman_exec_shell_command(
+            cid_file_name=cid,
+            cmd=f"mv {socket} {socket}.moved",
+        )
+        output = PodmanCLIWrapper.podman_exec_shell_command(
+            cid_file_name=cid, cmd=liveness_cmd
+        )
+        assert "failed" in output
@@ -7,6 +7,7 @@ from container_ci_suite.engines.podman_wrapper import PodmanCLIWrapper
 import pytest
 
 from conftest import VARS
+from polling import wait_for_log
 
 
 class TestMariaDBUpgradeContainer:
@@ -144,8 +145,7 @@ class TestMariaDBUpgradeContainer:
         assert self.s2i_db.test_db_connection(
             container_ip=cip, username=mysql_user, password=mysql_password
         )
-        output = PodmanCLIWrapper.podman_logs(
-            container_id=cid,
-        )
+        # The data directory actions are logged before the final exec of the server
+        output = wait_for_log(cid, "Running final exec")
         PodmanCLIWrapper.call_podman_command(cmd=f"stop {cid}")
         return output